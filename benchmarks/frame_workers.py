@@ -0,0 +1,44 @@
+"""
+Speedup of splitting one spin's frames across worker processes. Every
+timed spin starts with empty caches, in this process and in the workers.
+
+Run from the repository root:
+
+    python -m benchmarks.frame_workers [max_workers]
+"""
+import os
+import random
+import sys
+
+import wheel_generator
+
+GAMES = ["Minecraft", "Among Us", "Rocket League", "Stardew Valley", "Overwatch", "Hades",
+         "Deep Rock Galactic", "It Takes Two", "Portal 2", "Terraria", "Valheim", "Lethal Company",
+         "Phasmophobia", "Golf With Your Friends", "Fall Guys", "Jackbox Party Pack", "Sea of Thieves",
+         "Borderlands 3", "Risk of Rain 2", "Left 4 Dead 2", "Gang Beasts", "Raft", "Overcooked! 2",
+         "Barotrauma", "Content Warning"]
+# Same shape of roster, different labels, so warming up fills no cache the timed spin uses
+WARM_UP_GAMES = [f"Warm-up game {i + 1}" for i in range(len(GAMES))]
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    print(f"{os.cpu_count()} CPUs, 25-game spin")
+
+    for mode in wheel_generator.RENDER_MODES:
+        baseline = None
+        for workers in range(1, max_workers + 1):
+            if workers > 1:
+                # Untimed spin so a fresh pool's processes are already started.
+                wheel_generator.shutdown_frame_pool()
+                wheel_generator.generate_wheel_of_games(WARM_UP_GAMES, 0, render_mode=mode, frame_workers=workers)
+            wheel_generator.clear_caches()
+            random.seed(25)
+            result = wheel_generator.generate_wheel_of_games(GAMES, 0, render_mode=mode, frame_workers=workers)
+            total = result.timings["total_ms"]
+            baseline = baseline or total
+            print(f"[{mode}] {workers} worker(s): {total:.0f}ms, speedup {baseline / total:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Seeded render benchmark for both wheel generators, across game counts and
+label lengths. Every case starts with empty render caches, so runs are
+comparable between commits.
+
+Run from the repository root:
+
+    python -m benchmarks.render_benchmark [-o results.json] [--compare baseline.json]
+
+Each result records ms per frame, render and encode time, output size,
+frame count and the tracemalloc peak (Python and NumPy allocations; Pillow's
+own buffers aren't traced), plus the process's max RSS so far.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from renderers import RENDERERS, SPIN_PROFILES, get_renderer
+
+GAME_COUNTS = (2, 5, 12, 25)
+LABELS = {
+    "short": ["Hades", "Raft", "Portal", "Halo", "Doom", "Rust", "Limbo", "Inside"],
+    "medium": ["Rocket League", "Stardew Valley", "Among Us", "Deep Rock", "Sea of Thieves",
+               "Fall Guys", "Risk of Rain 2", "Gang Beasts"],
+    "long": ["Golf With Your Friends", "Jackbox Party Pack 7", "Keep Talking and Nobody Explodes",
+             "Overcooked! 2: Surf n Turf", "Deep Rock Galactic: Survivor", "Left 4 Dead 2 Campaign",
+             "Phasmophobia Nightmare", "It Takes Two Friends Pass"],
+}
+SEED = 1234
+
+
+def _games(count: int, length: str) -> list[str]:
+    labels = LABELS[length]
+    # Numbered once the list runs out, so rosters of any size stay distinct.
+    return [labels[i % len(labels)] + (f" {i // len(labels) + 1}" if i >= len(labels) else "") for i in range(count)]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(renderer: str, count: int, length: str, options: dict) -> dict:
+    if renderer == "pil":
+        import wheel_generator
+        wheel_generator.clear_caches()
+    generate = get_renderer(renderer)
+    games = _games(count, length)
+
+    random.seed(SEED + count)
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = generate(games, count // 2, **options)
+    wall_ms = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = result.timings
+    return {
+        "renderer": renderer,
+        "options": options,
+        "games": count,
+        "labels": length,
+        "frames": result.frame_count,
+        "bytes": result.size_bytes,
+        "settings": result.settings,
+        "ms_per_frame": timings["render_ms"] / result.frame_count,
+        "render_ms": timings["render_ms"],
+        "encode_ms": timings["encode_ms"],
+        "total_ms": wall_ms,
+        "tracemalloc_peak_bytes": peak,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _case_key(result: dict) -> tuple:
+    return result["renderer"], json.dumps(result["options"], sort_keys=True), result["games"], result["labels"]
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    with open(baseline_path) as fp:
+        baseline = {_case_key(result): result for result in json.load(fp)["results"]}
+    print(f"\nAgainst {baseline_path}:")
+    for result in results:
+        old = baseline.get(_case_key(result))
+        if old is None:
+            continue
+        print(f"  {result['renderer']:6} {result['games']:2} games {result['labels']:6}  "
+              f"total {result['total_ms'] / old['total_ms'] - 1:+6.1%}  "
+              f"bytes {result['bytes'] / old['bytes'] - 1:+6.1%}  "
+              f"peak {result['tracemalloc_peak_bytes'] / max(old['tracemalloc_peak_bytes'], 1) - 1:+6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="print changes against an earlier JSON output")
+    parser.add_argument("--renderers", nargs="+", default=list(RENDERERS), choices=list(RENDERERS))
+    parser.add_argument("--counts", nargs="+", type=int, default=list(GAME_COUNTS))
+    parser.add_argument("--labels", nargs="+", default=list(LABELS), choices=list(LABELS))
+    parser.add_argument("--render-modes", nargs="+", help="PIL render modes to run (default: its default mode)")
+    parser.add_argument("--max-bytes", type=int, help="byte budget for PIL spins (default: none)")
+    parser.add_argument("--spin-profiles", nargs="+", choices=list(SPIN_PROFILES),
+                        help="PIL spin profiles to run (default: the standard one)")
+    args = parser.parse_args()
+
+    cases = []
+    for renderer in args.renderers:
+        option_sets = [{"render_mode": mode} for mode in args.render_modes] \
+            if renderer == "pil" and args.render_modes else [{}]
+        if renderer == "pil" and args.max_bytes:
+            option_sets = [{**options, "max_bytes": args.max_bytes} for options in option_sets]
+        if renderer == "pil" and args.spin_profiles:
+            option_sets = [{**options, "spin_profile": profile}
+                           for options in option_sets for profile in args.spin_profiles]
+        for options in option_sets:
+            for count in args.counts:
+                for length in args.labels:
+                    cases.append((renderer, count, length, options))
+
+    results = []
+    for renderer, count, length, options in cases:
+        result = run_case(renderer, count, length, options)
+        results.append(result)
+        label = renderer + "".join(f" {value}" for value in options.values())
+        print(f"[{label}] {count:2} games, {length:6} labels: {result['frames']} frames, "
+              f"{result['ms_per_frame']:.1f}ms/frame, render {result['render_ms']:.0f}ms, "
+              f"encode {result['encode_ms']:.0f}ms, {result['bytes'] / 1024:.0f} KiB, "
+              f"peak {result['tracemalloc_peak_bytes'] / 2 ** 20:.1f} MiB")
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump({
+                "commit": _git_commit(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "seed": SEED,
+                "results": results,
+            }, fp, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
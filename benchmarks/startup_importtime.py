@@ -0,0 +1,60 @@
+"""
+Import time of bot startup, up to and including load_cogs, measured with
+`python -X importtime` in a fresh interpreter. Exits non-zero if the total
+is over budget or a module the bot process shouldn't need (the renderers'
+heavy dependencies) was imported.
+
+Run from the repository root:
+
+    python -m benchmarks.startup_importtime [budget_ms]
+
+aiohttp always shows up: discord.py imports it itself.
+"""
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 1000
+# Only render workers should ever import these.
+FORBIDDEN = ("numpy", "matplotlib", "PIL", "wheel_generator", "wheel_generator_legacy")
+STARTUP = "import asyncio, bot; asyncio.run(bot.load_cogs())"
+
+
+def measure() -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every import, nested ones indented as -X importtime prints them."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP],
+        capture_output=True, text=True, check=True,
+    )
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((name.rstrip(), int(own), int(cumulative)))
+    return imports
+
+
+def main():
+    budget_ms = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    imports = measure()
+
+    top_level = [(name.strip(), cumulative) for name, _, cumulative in imports if not name.startswith("  ")]
+    total_ms = sum(cumulative for _, cumulative in top_level) / 1000
+    print(f"Startup imports: {total_ms:.0f}ms (budget {budget_ms}ms), {len(imports)} modules")
+    for name, cumulative in sorted(top_level, key=lambda item: -item[1])[:10]:
+        print(f"  {cumulative / 1000:7.1f}ms  {name}")
+
+    loaded = {name.strip() for name, _, _ in imports}
+    forbidden = [name for name in FORBIDDEN if name in loaded]
+    failed = False
+    if forbidden:
+        print(f"FAIL: imported at startup: {', '.join(forbidden)}")
+        failed = True
+    if total_ms > budget_ms:
+        print(f"FAIL: {total_ms:.0f}ms is over the {budget_ms}ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Banner thumbnail cache: time to fetch and shrink a server's worth of banners,
+what they take up on disk, and what drawing them as icons adds to a spin.
+Banners are generated JPEGs served from a local HTTP server, so no network
+is needed and runs are comparable between commits.
+
+Run from the repository root:
+
+    python -m benchmarks.thumbnail_cache [games]
+"""
+import asyncio
+import io
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image, ImageDraw
+
+import wheel_generator
+from util.thumbnail_cache import fetch_thumbnails, thumbnail_cache
+
+DEFAULT_GAMES = 25
+# Typical store banner size
+BANNER_SIZE = (920, 430)
+SEED = 1234
+
+
+def _banner(index: int) -> bytes:
+    rng = random.Random(SEED + index)
+    image = Image.new("RGB", BANNER_SIZE, tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(BANNER_SIZE[0]), rng.randrange(BANNER_SIZE[1])
+        r = rng.randrange(40, 200)
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def _serve(banners: list[bytes]) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            index = int(self.path.strip("/").split(".")[0])
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(banners[index])))
+            self.end_headers()
+            self.wfile.write(banners[index])
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _spin(games: list[str], icons) -> float:
+    wheel_generator.clear_caches()
+    random.seed(SEED)
+    result = wheel_generator.generate_wheel_of_games(games, len(games) // 2, icons=icons)
+    return result.timings["total_ms"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_GAMES
+    banners = [_banner(i) for i in range(count)]
+    server = _serve(banners)
+    urls = [f"http://127.0.0.1:{server.server_port}/{i}.jpg" for i in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Point the cache the renderer reads from at an empty directory
+        thumbnail_cache.directory = directory
+
+        # The banner server is on this machine, which the address check would refuse
+        started = time.perf_counter()
+        added = asyncio.run(fetch_thumbnails(thumbnail_cache, urls, allow_private_hosts=True))
+        fetch_ms = (time.perf_counter() - started) * 1000
+        stats = thumbnail_cache.stats()
+        print(f"Fetched {added} banners ({sum(map(len, banners)) / 1024:.0f} KiB) in {fetch_ms:.0f}ms, "
+              f"cached {stats['bytes'] / 1024:.1f} KiB ({stats['bytes'] / max(stats['entries'], 1):.0f} B each)")
+
+        started = time.perf_counter()
+        asyncio.run(fetch_thumbnails(thumbnail_cache, urls, allow_private_hosts=True))
+        print(f"Refetch with everything cached: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+        # Trimmed to half its size, the least recently used half goes
+        for url in urls[count // 2:]:
+            thumbnail_cache.get(url)
+            time.sleep(0.01)
+        thumbnail_cache.max_bytes = stats["bytes"] // 2
+        thumbnail_cache.trim()
+        kept = [url for url in urls if url in thumbnail_cache]
+        print(f"Trimmed to {thumbnail_cache.max_bytes / 1024:.1f} KiB: kept {len(kept)}, "
+              f"all recently used: {set(kept) <= set(urls[count // 2:])}")
+        thumbnail_cache.max_bytes = stats["bytes"] * 2
+        asyncio.run(fetch_thumbnails(thumbnail_cache, urls, allow_private_hosts=True))
+
+        games = [f"Game {i + 1}" for i in range(count)]
+        without = _spin(games, None)
+        with_icons = _spin(games, urls)
+        print(f"{count}-game spin: {without:.0f}ms with names, {with_icons:.0f}ms with icons "
+              f"({with_icons / without - 1:+.1%})")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,9 @@ import os
 import discord
 from discord.ext import commands
 
-from db import database
+from db import async_database, database
 from db.migration_controller import run_migrations
+from render_service import render_service
 
 from util.logger import setup_logger
 
@@ -82,9 +83,18 @@ async def main():
         run_migrations()
 
         database.initialize_database()
-        await load_cogs()
-        await bot.start(TOKEN)
 
+        # Spin up render workers before logging in so the first spin is warm
+        render_service.start()
+        try:
+            await load_cogs()
+            await bot.start(TOKEN)
+        finally:
+            render_service.shutdown()
+            async_database.shutdown()
 
-# Use asyncio to call the main function
-asyncio.run(main())
+
+# Use asyncio to call the main function. Guarded because render workers are
+# spawned processes, which import this module as well.
+if __name__ == "__main__":
+    asyncio.run(main())
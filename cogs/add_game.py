@@ -4,8 +4,9 @@ import discord
 from discord import Interaction
 from discord.ext import commands
 
-from db.database import add_game_to_db, get_least_playcount_for_server
+from db.async_database import add_game_to_db, get_least_playcount_for_server
 from db.models import Game
+from util.thumbnail_cache import prefetch_thumbnails
 
 
 class AddGameCommand(commands.Cog):
@@ -24,7 +25,7 @@ class AddGameCommand(commands.Cog):
 
         server_id = str(interaction.guild.id)
         try:
-            playcount_offset = get_least_playcount_for_server(server_id)
+            playcount_offset = await get_least_playcount_for_server(server_id)
 
             game = Game(
                 server_id=server_id,
@@ -35,7 +36,10 @@ class AddGameCommand(commands.Cog):
                 banner_link=banner_link,
                 playcount_offset=playcount_offset
             )
-            add_game_to_db(game)
+            await add_game_to_db(game)
+            if banner_link:
+                # Ready for the wheel's icons by the time it's next spun
+                prefetch_thumbnails([banner_link])
             await interaction.response.send_message(f"'{name}' has been added to t’list!")
         except sqlite3.IntegrityError:
             await interaction.response.send_message("Error: Game already exists.")
@@ -2,7 +2,7 @@ import discord
 from discord import Interaction, ui, Embed
 from discord.ext import commands
 
-from db.database import (
+from db.async_database import (
     archive_game_in_db,
     unarchive_game_in_db,
     fetch_game_from_db,
@@ -24,7 +24,7 @@ class ConfirmArchive(ui.View):
     @ui.button(label="Yes, archive it", style=discord.ButtonStyle.primary)
     async def confirm(self, interaction: Interaction, button: ui.Button):
         server_id = str(interaction.guild.id)
-        success = archive_game_in_db(server_id, self.game_name)
+        success = await archive_game_in_db(server_id, self.game_name)
         await interaction.response.defer(ephemeral=True)
         if success:
             await self.original_interaction.delete_original_response()
@@ -79,7 +79,7 @@ class ConfirmUnarchive(ui.View):
     @ui.button(label="Yes, unarchive it", style=discord.ButtonStyle.success)
     async def confirm(self, interaction: Interaction, button: ui.Button):
         server_id = str(interaction.guild.id)
-        success = unarchive_game_in_db(server_id, self.game_name)
+        success = await unarchive_game_in_db(server_id, self.game_name)
         await interaction.response.defer(ephemeral=True)
         if success:
             await self.original_interaction.delete_original_response()
@@ -138,7 +138,7 @@ class ArchiveGameCommand(commands.Cog):
     async def archive_game(self, interaction: Interaction, name: str):
         server_id = str(interaction.guild.id)
 
-        game = fetch_game_from_db(server_id, name)
+        game = await fetch_game_from_db(server_id, name)
         if game is None:
             await interaction.response.send_message("❌ Error: No such game found.", ephemeral=True)
             return
@@ -168,7 +168,7 @@ class ArchiveGameCommand(commands.Cog):
     async def autocomplete_active_games(self, interaction: Interaction, current: str):
         """Autocomplete from non-archived games only."""
         server_id = str(interaction.guild.id)
-        games = get_all_server_games(server_id, search=current)[:25]
+        games = (await get_all_server_games(server_id, search=current))[:25]
         return [
             discord.app_commands.Choice(name=game.name, value=game.name)
             for game in games
@@ -183,7 +183,7 @@ class ArchiveGameCommand(commands.Cog):
     async def unarchive_game(self, interaction: Interaction, name: str):
         server_id = str(interaction.guild.id)
 
-        game = fetch_game_from_db(server_id, name)
+        game = await fetch_game_from_db(server_id, name)
         if game is None:
             await interaction.response.send_message("❌ Error: No such game found.", ephemeral=True)
             return
@@ -212,7 +212,7 @@ class ArchiveGameCommand(commands.Cog):
     async def autocomplete_archived_games(self, interaction: Interaction, current: str):
         """Autocomplete from archived games only."""
         server_id = str(interaction.guild.id)
-        games = get_archived_server_games(server_id, search=current)[:25]
+        games = (await get_archived_server_games(server_id, search=current))[:25]
         return [
             discord.app_commands.Choice(name=game.name, value=game.name)
             for game in games
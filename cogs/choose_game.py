@@ -1,34 +1,147 @@
 import asyncio
+import io
+import os
 import random
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional
 
 import discord
 from discord import Interaction, ui, Embed
 from discord.ext import commands
 import logging
 
-from db.database import get_eligible_games, get_least_played_games, get_all_server_games, \
+from cogs.spin_profile import SPIN_PROFILE_CHOICES, server_spin_profile
+from db.async_database import get_eligible_games, get_least_played_games, get_all_server_games, \
     log_game_selection, fetch_game_with_memory
 from db.models import GameWithPlayHistory
 from event_handler import schedule_game_event
+from render_service import render_service, RenderFailedError, RenderQueueFullError, LATENCY_TARGET_MS, MAX_BYTES
+from renderers import DEFAULT_RENDERER, DEFAULT_SPIN_PROFILE, LEGACY_RENDERER, WheelResult, max_wheel_games
 from util import date_util
-import wheel_generator
-import wheel_generator_legacy
+from util.thumbnail_cache import prefetch_thumbnails
 
 logger = logging.getLogger(__name__)
 
-def create_wheel_for_discord(games: List[str], winning_index: int, filename: str, legacy: bool = False) -> tuple[discord.File, int]:
-    if legacy:
-        wheel_generator_legacy.generate_wheel_of_games(games, winning_index, filename)
-        gif_duration = wheel_generator_legacy.calculate_gif_duration(filename)
-    else:
-        wheel_generator.generate_wheel_of_games(games, winning_index, filename)
-        gif_duration = wheel_generator.calculate_gif_duration(filename)
+WHEEL_FILENAME = "wheel_of_games"  # plus the result's format as extension
+# Set to a file path to also write every rendered wheel to disk, for debugging.
+DEBUG_DUMP_PATH = os.environ.get("WHEEL_DEBUG_DUMP")
+
+
+WHEEL_BUSY_MESSAGE = "The wheel's a bit busy right now, give it a moment and try again! 🎡"
+WHEEL_FAILED_MESSAGE = "The wheel fell off while spinning 🛞 Please try again!"
+
+
+def renderer_for(legacy_wheel: bool) -> str:
+    return LEGACY_RENDERER if legacy_wheel else DEFAULT_RENDERER
+
+
+def wheel_icons(games: List[GameWithPlayHistory], show_icons: bool) -> Optional[List[Optional[str]]]:
+    """
+    Banner URLs to draw as icons on the wheel, if asked for. Spins only use
+    thumbnails that are already cached, so any missing ones are fetched in
+    the background for next time.
+    """
+    if not show_icons:
+        return None
+    urls = [game.banner_link for game in games]
+    prefetch_thumbnails(urls)
+    return urls
+
+
+def upload_budget(guild: Optional[discord.Guild]) -> int:
+    """Largest wheel to upload: WHEEL_MAX_BYTES, or the server's upload limit if that is lower."""
+    limit = guild.filesize_limit if guild is not None else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+    return min(MAX_BYTES, limit)
+
+
+async def render_wheel(games: List[str], winning_index: int, renderer: str = DEFAULT_RENDERER,
+                       latency_target_ms: Optional[float] = LATENCY_TARGET_MS,
+                       max_bytes: Optional[int] = MAX_BYTES,
+                       icons: Optional[List[Optional[str]]] = None,
+                       spin_profile: str = DEFAULT_SPIN_PROFILE,
+                       server_id: Optional[str] = None) -> WheelResult:
+    # Rendered in a worker process, into its own in-memory GIF, so the event loop
+    # stays responsive and concurrent spins never share a file. Renderers are
+    # looked up by name and only imported by the worker that first uses them.
+    # Under load a spin may come back at lower quality, or as a still, to
+    # arrive within the latency target, and large ones are made smaller to
+    # fit the upload budget. A server's spins go to the same worker where
+    # possible, so its rerolls reuse the labels and frames it has cached.
+    result = await render_service.render(games, winning_index, renderer=renderer, file_name=DEBUG_DUMP_PATH,
+                                         latency_target_ms=latency_target_ms, max_bytes=max_bytes, icons=icons,
+                                         spin_profile=spin_profile, affinity=server_id)
+    logger.debug(f"Rendered {result.frame_count} frames ({result.size_bytes} bytes of {result.max_bytes}) at "
+                 f"{result.quality} quality {result.settings} in {result.timings['total_ms']:.0f}ms, "
+                 f"frame cache {result.frame_cache}")
+    return result
+
+
+def wheel_file(result: WheelResult) -> discord.File:
+    return discord.File(io.BytesIO(result.data), filename=f"{WHEEL_FILENAME}.{result.format}")
+
+
+async def create_wheel_for_discord(games: List[str], winning_index: int, renderer: str = DEFAULT_RENDERER,
+                                   latency_target_ms: Optional[float] = LATENCY_TARGET_MS,
+                                   max_bytes: Optional[int] = MAX_BYTES,
+                                   icons: Optional[List[Optional[str]]] = None,
+                                   spin_profile: str = DEFAULT_SPIN_PROFILE,
+                                   server_id: Optional[str] = None) -> tuple[discord.File, float]:
+    result = await render_wheel(games, winning_index, renderer=renderer, latency_target_ms=latency_target_ms,
+                                max_bytes=max_bytes, icons=icons, spin_profile=spin_profile, server_id=server_id)
 
     # Send the spinning wheel GIF to Discord
-    with open(filename, "rb") as gif_file:
-        gif_file = discord.File(gif_file, filename=filename)
-        return gif_file, gif_duration
+    return wheel_file(result), result.duration
+
+
+@dataclass
+class RerollSpin:
+    """A reroll that has been picked and rendered, or the reason it couldn't be."""
+    game_options: Optional[List[GameWithPlayHistory]] = None
+    chosen_game: Optional[GameWithPlayHistory] = None
+    wheel: Optional[WheelResult] = None
+    error: Optional[str] = None
+
+
+async def prepare_reroll(server_id: str, player_count: int, exclude_game_id: str = None,
+                         ignore_least_played: bool = False, renderer: str = DEFAULT_RENDERER,
+                         max_bytes: Optional[int] = MAX_BYTES, show_icons: bool = False,
+                         spin_profile: str = DEFAULT_SPIN_PROFILE) -> RerollSpin:
+    """Pick and render a reroll without sending anything, so it can be done ahead of time."""
+    # Fetch eligible games
+    games = await get_eligible_games(server_id, player_count)
+    if not games:
+        return RerollSpin(error="No eligible games found.")
+
+    if not ignore_least_played:
+        games = await get_least_played_games(server_id, player_count)
+
+    if not games:
+        return RerollSpin(error="No eligible games found.")
+
+    max_games = max_wheel_games(renderer)
+    if len(games) > max_games:
+        games = random.sample(games, max_games)
+
+    # Pick a game
+    game_options, chosen_game = pick_game(games, exclude_game_id=exclude_game_id,
+                                          ignore_least_played_bias=ignore_least_played)
+    if not chosen_game:
+        return RerollSpin(error="No games available to choose from.")
+
+    # Generate the GIF
+    winning_index = game_options.index(chosen_game)
+    game_names = [game.name for game in game_options]
+    try:
+        wheel = await render_wheel(game_names, winning_index, renderer=renderer, max_bytes=max_bytes,
+                                   icons=wheel_icons(game_options, show_icons), spin_profile=spin_profile,
+                                   server_id=server_id)
+    except RenderQueueFullError:
+        return RerollSpin(error=WHEEL_BUSY_MESSAGE)
+    except RenderFailedError as e:
+        logger.error(f"Reroll render failed: {e}")
+        return RerollSpin(error=WHEEL_FAILED_MESSAGE)
+
+    return RerollSpin(game_options, chosen_game, wheel)
 
 
 # Embed for displaying chosen game
@@ -68,7 +181,8 @@ def pick_game(games: List[GameWithPlayHistory], exclude_game_id: str = None, ign
 
 
 class ConfirmChoice(ui.View):
-    def __init__(self, interaction, bot, initial_game, all_games, gif_message, player_count, server_id, event_day=None, legacy_wheel=False):
+    def __init__(self, interaction, bot, initial_game, all_games, gif_message, player_count, server_id, event_day=None, legacy_wheel=False,
+                 show_icons=False, spin_profile=DEFAULT_SPIN_PROFILE):
         super().__init__(timeout=300)
         self.interaction = interaction
         self.bot = bot
@@ -79,51 +193,92 @@ class ConfirmChoice(ui.View):
         self.server_id = server_id
         self.event_day = event_day
         self.legacy_wheel = legacy_wheel
+        self.show_icons = show_icons
+        self.spin_profile = spin_profile
+        # Rerolls rendered in the background while the card is shown, keyed by
+        # (exclude_game_id, ignore_least_played)
+        self.speculative_rerolls: dict[tuple[Optional[str], bool], asyncio.Task] = {}
 
-    async def regenerate_wheel(self, interaction, exclude_game_id=None, ignore_least_played=False):
-        # Fetch eligible games
-        games = get_eligible_games(self.server_id, self.player_count)
-        if not games:
-            await interaction.followup.send("No eligible games found.", ephemeral=True)
-            return None
+    def start_speculative_rerolls(self):
+        """
+        Start rendering the rerolls the buttons can ask for, so pressing one
+        replies straight away instead of querying and rendering from scratch.
+        """
+        # A render can't be stopped once a worker has it, so only workers that
+        # would otherwise sit idle are used; one per reroll, most likely first.
+        idle_workers = render_service.idle_workers
+        if idle_workers == 0:
+            logger.debug("No idle render workers, not pre-rendering rerolls")
+            return
 
-        if not ignore_least_played:
-            games = get_least_played_games(self.server_id, self.player_count)
+        for key in [(self.current_game.id, False), (None, True)][:idle_workers]:
+            exclude_game_id, ignore_least_played = key
+            self.speculative_rerolls[key] = asyncio.create_task(prepare_reroll(
+                self.server_id, self.player_count, exclude_game_id=exclude_game_id,
+                ignore_least_played=ignore_least_played, renderer=renderer_for(self.legacy_wheel),
+                max_bytes=upload_budget(self.interaction.guild), show_icons=self.show_icons,
+                spin_profile=self.spin_profile
+            ))
 
-        if not games:
-            await interaction.followup.send("No eligible games found.", ephemeral=True)
-            return None
+    def discard_speculative_rerolls(self):
+        """
+        Stop waiting for pre-rendered rerolls nobody will use. Ones still
+        queued are dropped; one already rendering finishes in its worker.
+        """
+        for task in self.speculative_rerolls.values():
+            task.cancel()
+        self.speculative_rerolls.clear()
+
+    def stop(self):
+        self.discard_speculative_rerolls()
+        super().stop()
+
+    async def take_reroll(self, exclude_game_id=None, ignore_least_played=False) -> RerollSpin:
+        """The pre-rendered reroll if there is a usable one, otherwise a fresh one."""
+        task = self.speculative_rerolls.pop((exclude_game_id, ignore_least_played), None)
+        self.discard_speculative_rerolls()
+        if task is not None:
+            try:
+                reroll = await task
+                if reroll.error not in (WHEEL_BUSY_MESSAGE, WHEEL_FAILED_MESSAGE):
+                    logger.debug("Using pre-rendered reroll")
+                    return reroll
+            except Exception as e:
+                logger.warning(f"Pre-rendered reroll failed, rendering again: {e}")
+
+        return await prepare_reroll(self.server_id, self.player_count, exclude_game_id=exclude_game_id,
+                                    ignore_least_played=ignore_least_played,
+                                    renderer=renderer_for(self.legacy_wheel),
+                                    max_bytes=upload_budget(self.interaction.guild),
+                                    show_icons=self.show_icons, spin_profile=self.spin_profile)
 
-        # Pick a game
-        game_options, chosen_game = pick_game(games, exclude_game_id=exclude_game_id,
-                                              ignore_least_played_bias=ignore_least_played)
-        if not chosen_game:
-            await interaction.followup.send("No games available to choose from.", ephemeral=True)
+    async def regenerate_wheel(self, interaction, exclude_game_id=None, ignore_least_played=False):
+        reroll = await self.take_reroll(exclude_game_id=exclude_game_id, ignore_least_played=ignore_least_played)
+        if reroll.error:
+            await interaction.followup.send(reroll.error, ephemeral=True)
             return None
 
-        # Generate the GIF
-        winning_index = game_options.index(chosen_game)
-        file_name = "wheel_of_games.gif"
-        game_names = [game.name for game in game_options]
-        gif_file, gif_duration = create_wheel_for_discord(game_names, winning_index, file_name, legacy=self.legacy_wheel)
+        chosen_game = reroll.chosen_game
 
         # Send the new spinning wheel GIF and remove the old one
         await self.gif_message.delete()
         new_gif_message = await interaction.followup.send(
             content="🎉 The wheel is spinning... hold tight!",
-            file=gif_file,
+            file=wheel_file(reroll.wheel),
             ephemeral=False
         )
 
-        await asyncio.sleep(gif_duration)
+        await asyncio.sleep(reroll.wheel.duration)
 
         # Send the new embed with buttons
         embed = create_game_embed(chosen_game)
         new_view = ConfirmChoice(
-            self.interaction, self.bot, chosen_game, game_options, new_gif_message, self.player_count, self.server_id,
-            self.event_day, legacy_wheel=self.legacy_wheel
+            self.interaction, self.bot, chosen_game, reroll.game_options, new_gif_message, self.player_count,
+            self.server_id, self.event_day, legacy_wheel=self.legacy_wheel, show_icons=self.show_icons,
+            spin_profile=self.spin_profile
         )
-        await interaction.followup.send(embed=embed, view=new_view)
+        new_view.message = await interaction.followup.send(embed=embed, view=new_view)
+        new_view.start_speculative_rerolls()
         return chosen_game
 
     @ui.button(label="Aye, we'll play this one.", style=discord.ButtonStyle.success)
@@ -133,7 +288,7 @@ class ConfirmChoice(ui.View):
 
         scheduled_event, event_date = await schedule_game_event(interaction, self.current_game, self.event_day)
 
-        log_game_selection(self.current_game.id, event_date)
+        await log_game_selection(self.current_game.id, event_date)
 
         if scheduled_event is not None:
             await interaction.message.edit(
@@ -179,6 +334,7 @@ class ConfirmChoice(ui.View):
         self.stop()
 
     async def on_timeout(self):
+        self.discard_speculative_rerolls()
         # Public message — self.message is the result card followup, stored after send so we edit only that message.
         for child in self.children:
             child.disabled = True
@@ -205,7 +361,10 @@ class ChooseGameCommand(commands.Cog):
         event_day="Schedule the event on a specific day (format: dd/MMM, e.g. 18/Dec). Leave blank for default.",
         force_game="Force a specific game to be selected regardless of play count or eligibility.",
         legacy_wheel="Use the original wheel style instead of the new one.",
+        show_icons="Show each game's banner on its slice, once the bot has a copy of it.",
+        spin="How long the wheel spins. Leave blank for the server's default (see /spinprofile).",
     )
+    @discord.app_commands.choices(spin=SPIN_PROFILE_CHOICES)
     async def choose_game(
             self,
             interaction: Interaction,
@@ -213,9 +372,12 @@ class ChooseGameCommand(commands.Cog):
             ignore_least_played: bool = False,
             event_day: str = None,
             force_game: str = None,
-            legacy_wheel: bool = False
+            legacy_wheel: bool = False,
+            show_icons: bool = False,
+            spin: discord.app_commands.Choice[str] = None
     ):
         server_id = str(interaction.guild.id)
+        spin_profile = spin.value if spin else await server_spin_profile(server_id)
 
         if event_day:
             try:
@@ -228,14 +390,15 @@ class ChooseGameCommand(commands.Cog):
                 return
 
         # Fetch games
-        games = get_eligible_games(server_id, player_count)
+        games = await get_eligible_games(server_id, player_count)
 
         if not ignore_least_played:
-            games = get_least_played_games(server_id, player_count)
+            games = await get_least_played_games(server_id, player_count)
 
-        if len(games) > 25:
-            logger.info(f"Reducing games to 25, currently it is {len(games)}")
-            games = random.sample(games, 25)
+        max_games = max_wheel_games(renderer_for(legacy_wheel))
+        if len(games) > max_games:
+            logger.info(f"Reducing games to {max_games}, currently it is {len(games)}")
+            games = random.sample(games, max_games)
 
         if not games:
             await interaction.response.send_message(f"No games support {player_count} players!", ephemeral=True)
@@ -245,7 +408,7 @@ class ChooseGameCommand(commands.Cog):
         game_options, chosen_game = pick_game(games, ignore_least_played_bias=ignore_least_played)
 
         if force_game:
-            matching_game = fetch_game_with_memory(server_id, force_game)
+            matching_game = await fetch_game_with_memory(server_id, force_game)
 
             if matching_game is None:
                 await interaction.response.send_message(
@@ -270,9 +433,19 @@ class ChooseGameCommand(commands.Cog):
 
         # Generate the GIF
         winning_index = game_options.index(chosen_game)
-        file_name = "wheel_of_games.gif"
         games = [game.name for game in game_options]
-        gif_file, gif_duration = create_wheel_for_discord(games, winning_index, file_name, legacy=legacy_wheel)
+        try:
+            gif_file, gif_duration = await create_wheel_for_discord(
+                games, winning_index, renderer=renderer_for(legacy_wheel), max_bytes=upload_budget(interaction.guild),
+                icons=wheel_icons(game_options, show_icons), spin_profile=spin_profile, server_id=server_id
+            )
+        except RenderQueueFullError:
+            await interaction.followup.send(WHEEL_BUSY_MESSAGE, ephemeral=True)
+            return
+        except RenderFailedError as e:
+            logger.error(f"Wheel render failed: {e}")
+            await interaction.followup.send(WHEEL_FAILED_MESSAGE)
+            return
 
         # Send the spinning wheel GIF
         gif_message = await interaction.followup.send(
@@ -286,8 +459,10 @@ class ChooseGameCommand(commands.Cog):
         # Send the embed with buttons
         embed = create_game_embed(chosen_game)
         view = ConfirmChoice(interaction, self.bot, chosen_game, game_options, gif_message, player_count, server_id,
-                             event_day, legacy_wheel=legacy_wheel)
+                             event_day, legacy_wheel=legacy_wheel, show_icons=show_icons,
+                             spin_profile=spin_profile)
         view.message = await interaction.followup.send(embed=embed, view=view)
+        view.start_speculative_rerolls()
 
     @choose_game.autocomplete("event_day")
     async def autocomplete_event_day(self, interaction: Interaction, current: str):
@@ -306,7 +481,7 @@ class ChooseGameCommand(commands.Cog):
     async def autocomplete_force_game(self, interaction: Interaction, current: str):
         """Provide autocomplete suggestions for game names."""
         server_id = str(interaction.guild.id)
-        game_names = get_all_server_games(server_id, search=current)[:25]  # Fetch a list of game names from the database
+        game_names = (await get_all_server_games(server_id, search=current))[:25]  # Fetch a list of game names from the database
 
         return [
             discord.app_commands.Choice(name=game.name, value=game.name)
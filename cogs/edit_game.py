@@ -2,7 +2,7 @@ import discord
 from discord import Interaction, ui, Embed
 from discord.ext import commands
 
-from db.database import fetch_game_from_db, edit_game_in_db, get_all_server_games
+from db.async_database import fetch_game_from_db, edit_game_in_db, get_all_server_games
 
 
 class ConfirmEdit(ui.View):
@@ -17,7 +17,7 @@ class ConfirmEdit(ui.View):
     @ui.button(label="Yes, save changes", style=discord.ButtonStyle.success)
     async def confirm(self, interaction: Interaction, button: ui.Button):
         server_id = str(interaction.guild.id)
-        success = edit_game_in_db(server_id, self.game_name, **self.updates)
+        success = await edit_game_in_db(server_id, self.game_name, **self.updates)
 
         if success:
             # Build summary embed for public announcement
@@ -105,7 +105,7 @@ class EditGameCommand(commands.Cog):
         banner_link: str = None,
     ):
         server_id = str(interaction.guild.id)
-        game = fetch_game_from_db(server_id, name)
+        game = await fetch_game_from_db(server_id, name)
 
         if not game:
             await interaction.response.send_message("Error: No such game found.", ephemeral=True)
@@ -154,7 +154,7 @@ class EditGameCommand(commands.Cog):
     async def autocomplete_games(self, interaction: Interaction, current: str):
         """Provide autocomplete suggestions for game names."""
         server_id = str(interaction.guild.id)
-        games = get_all_server_games(server_id, search=current)[:25]
+        games = (await get_all_server_games(server_id, search=current))[:25]
 
         return [
             discord.app_commands.Choice(name=game.name, value=game.name)
@@ -2,7 +2,7 @@ import discord
 from discord import Interaction, Embed
 from discord.ext import commands
 
-from db.database import get_all_server_games, get_eligible_games
+from db.async_database import get_all_server_games, get_eligible_games
 
 
 class ListGamesCommand(commands.Cog):
@@ -15,10 +15,10 @@ class ListGamesCommand(commands.Cog):
 
         if player_count:
             # Fetch games filtered by player_count
-            games = get_eligible_games(server_id, player_count)
+            games = await get_eligible_games(server_id, player_count)
         else:
             # Fetch all games if player_count is not provided
-            games = get_all_server_games(server_id)
+            games = await get_all_server_games(server_id)
 
         if not games:
             await interaction.response.send_message(
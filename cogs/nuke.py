@@ -3,7 +3,7 @@ from discord import Interaction, ui
 from discord.ext import commands
 from discord.ui import Button
 
-from db.database import nuke_playcounts
+from db.async_database import nuke_playcounts
 
 
 # Confirmation View with Buttons
@@ -22,7 +22,7 @@ class NukeConfirmationView(ui.View):
             return
 
         # Call the function to nuke playcounts
-        result = nuke_playcounts(self.server_id)
+        result = await nuke_playcounts(self.server_id)
 
         # Acknowledge the action
         if result:
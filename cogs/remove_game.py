@@ -2,7 +2,7 @@ import discord
 from discord import Interaction, ui, Embed
 from discord.ext import commands
 
-from db.database import remove_game_from_db, fetch_game_from_db, get_all_server_games_including_archived
+from db.async_database import remove_game_from_db, fetch_game_from_db, get_all_server_games_including_archived
 
 
 class ConfirmRemove(ui.View):
@@ -22,7 +22,7 @@ class ConfirmRemove(ui.View):
             return
 
         server_id = str(interaction.guild.id)
-        successful_removal = remove_game_from_db(server_id, self.game_name)
+        successful_removal = await remove_game_from_db(server_id, self.game_name)
         if successful_removal:
             embed = Embed(
                 title="🗑️ Game Permanently Deleted",
@@ -73,7 +73,7 @@ class RemoveGameCommand(commands.Cog):
     async def remove_game(self, interaction: Interaction, name: str):
         server_id = str(interaction.guild.id)
 
-        game = fetch_game_from_db(server_id, name)
+        game = await fetch_game_from_db(server_id, name)
         if game is None:
             await interaction.response.send_message("❌ Error: No such game found.", ephemeral=True)
             return
@@ -104,7 +104,7 @@ class RemoveGameCommand(commands.Cog):
     async def autocomplete_games(self, interaction: Interaction, current: str):
         """Provide autocomplete suggestions for game names (includes archived games)."""
         server_id = str(interaction.guild.id)
-        games = get_all_server_games_including_archived(server_id, search=current)[:25]
+        games = (await get_all_server_games_including_archived(server_id, search=current))[:25]
         return [
             discord.app_commands.Choice(name=game.name, value=game.name)
             for game in games
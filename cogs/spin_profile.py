@@ -0,0 +1,53 @@
+import discord
+from discord import Interaction
+from discord.ext import commands
+
+from db.async_database import get_spin_profile, set_spin_profile
+from renderers import DEFAULT_SPIN_PROFILE, SPIN_PROFILES
+
+# Shown wherever a spin profile can be picked, in renderers.SPIN_PROFILES order.
+SPIN_PROFILE_CHOICES = [
+    discord.app_commands.Choice(name="Standard (about 12s)", value="standard"),
+    discord.app_commands.Choice(name="Short (about 6s)", value="short"),
+    discord.app_commands.Choice(name="Instant (about 2s)", value="instant"),
+]
+if tuple(choice.value for choice in SPIN_PROFILE_CHOICES) != SPIN_PROFILES:
+    raise RuntimeError(f"SPIN_PROFILE_CHOICES don't match renderers.SPIN_PROFILES {SPIN_PROFILES}")
+
+
+async def server_spin_profile(server_id: str) -> str:
+    """The spin profile /choosegame uses in a server when none is given."""
+    spin_profile = await get_spin_profile(server_id)
+    return spin_profile if spin_profile in SPIN_PROFILES else DEFAULT_SPIN_PROFILE
+
+
+class SpinProfileCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @discord.app_commands.command(name="spinprofile", description="Show or set how long the wheel spins in this server")
+    @discord.app_commands.describe(profile="Default spin for /choosegame. Leave blank to see the current one.")
+    @discord.app_commands.choices(profile=SPIN_PROFILE_CHOICES)
+    @discord.app_commands.default_permissions(manage_guild=True)
+    @discord.app_commands.guild_only()
+    async def spin_profile(self, interaction: Interaction, profile: discord.app_commands.Choice[str] = None):
+        """Set the server's default spin profile, so busy servers can stop waiting on long spins."""
+        server_id = str(interaction.guild.id)
+
+        if profile is None:
+            await interaction.response.send_message(
+                f"Wheels in this server spin with the **{await server_spin_profile(server_id)}** profile.", ephemeral=True
+            )
+            return
+
+        await set_spin_profile(server_id, profile.value)
+        await interaction.response.send_message(
+            f"Wheels in this server will now spin with the **{profile.value}** profile. "
+            f"`/choosegame spin` still overrides it for a single spin.",
+            ephemeral=True
+        )
+
+
+# Add the cog to the bot
+async def setup(bot):
+    await bot.add_cog(SpinProfileCog(bot))
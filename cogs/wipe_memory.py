@@ -5,7 +5,7 @@ from discord import Interaction, ui
 from discord.ext import commands
 from discord.ui import Button
 
-from db.database import fetch_game_from_db, get_all_server_games, fetch_game_with_memory, mark_game_logs_as_ignored
+from db.async_database import fetch_game_from_db, get_all_server_games, fetch_game_with_memory, mark_game_logs_as_ignored
 
 
 # Confirmation View with Buttons
@@ -24,7 +24,7 @@ class ConfirmationView(ui.View):
         if self.memory_epoch:
             memory_date = datetime.fromtimestamp(self.memory_epoch)
 
-        result = mark_game_logs_as_ignored(self.server_id, self.game_name, memory_date)
+        result = await mark_game_logs_as_ignored(self.server_id, self.game_name, memory_date)
 
         if result:
             await interaction.response.edit_message(
@@ -76,7 +76,7 @@ class GameWipeMemoryCog(commands.Cog):
         """Wipe the memory of a specific game (mark entries as ignored)."""
         server_id = str(interaction.guild.id)
 
-        game = fetch_game_from_db(server_id, game_name)
+        game = await fetch_game_from_db(server_id, game_name)
         if game is None:
             await interaction.response.send_message("Error: No such game found.", ephemeral=True)
             return
@@ -84,7 +84,7 @@ class GameWipeMemoryCog(commands.Cog):
         parsed_date = None
 
         if memory_date:
-            game = fetch_game_with_memory(server_id, game_name)
+            game = await fetch_game_with_memory(server_id, game_name)
             memory_datetime = datetime.fromtimestamp(memory_date)
             parsed_date = memory_datetime.strftime("%d %b %Y %H:%M")
             available_dates = [dt.strftime("%d %b %Y %H:%M") for dt in game.play_history]
@@ -116,7 +116,7 @@ class GameWipeMemoryCog(commands.Cog):
     async def autocomplete_games(self, interaction: Interaction, current: str):
         """Provide autocomplete suggestions for game names."""
         server_id = str(interaction.guild.id)
-        game_names = get_all_server_games(server_id, search=current)[:25]
+        game_names = (await get_all_server_games(server_id, search=current))[:25]
 
         return [
             discord.app_commands.Choice(name=game.name, value=game.name)
@@ -128,7 +128,7 @@ class GameWipeMemoryCog(commands.Cog):
         """Autocomplete function for memory dates based on the game name."""
         server_id = str(interaction.guild.id)
         game_name = interaction.namespace.game_name
-        game = fetch_game_with_memory(server_id, game_name)
+        game = await fetch_game_with_memory(server_id, game_name)
 
         return [
             discord.app_commands.Choice(name=date.strftime("%d %b %Y %H:%M"), value=date.timestamp())
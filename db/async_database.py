@@ -0,0 +1,104 @@
+"""
+Awaitable versions of the db.database functions, for cogs and anything
+else running on the event loop.
+
+Each call runs the synchronous SQLAlchemy function on a dedicated database
+thread, so a slow query or a wait on SQLite's write lock only holds up other
+queries, never the gateway heartbeat or unrelated interactions. One thread
+is enough: SQLite serialises writers anyway, and it keeps queries in the
+order they were made, so a write is always seen by the reads after it.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
+
+from db import database
+from db.models import Game, GameWithPlayHistory
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+
+
+async def _run(function, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(function, *args, **kwargs))
+
+
+def shutdown():
+    """Let queries already made finish, and stop the database thread."""
+    _executor.shutdown(wait=True)
+
+
+async def add_game_to_db(game: Game):
+    await _run(database.add_game_to_db, game)
+
+
+async def remove_game_from_db(server_id: str, name: str) -> bool:
+    return await _run(database.remove_game_from_db, server_id, name)
+
+
+async def archive_game_in_db(server_id: str, name: str) -> bool:
+    return await _run(database.archive_game_in_db, server_id, name)
+
+
+async def unarchive_game_in_db(server_id: str, name: str) -> bool:
+    return await _run(database.unarchive_game_in_db, server_id, name)
+
+
+async def fetch_game_from_db(server_id: str, name: str) -> Optional[Game]:
+    return await _run(database.fetch_game_from_db, server_id, name)
+
+
+async def fetch_game_with_memory(server_id: str, name: str) -> Optional[GameWithPlayHistory]:
+    return await _run(database.fetch_game_with_memory, server_id, name)
+
+
+async def get_all_server_games(server_id: str, search: Optional[str] = None) -> List[GameWithPlayHistory]:
+    return await _run(database.get_all_server_games, server_id, search=search)
+
+
+async def get_archived_server_games(server_id: str, search: Optional[str] = None) -> List[GameWithPlayHistory]:
+    return await _run(database.get_archived_server_games, server_id, search=search)
+
+
+async def get_all_server_games_including_archived(server_id: str,
+                                                  search: Optional[str] = None) -> List[GameWithPlayHistory]:
+    return await _run(database.get_all_server_games_including_archived, server_id, search=search)
+
+
+async def get_eligible_games(server_id: str, player_count: int) -> List[GameWithPlayHistory]:
+    return await _run(database.get_eligible_games, server_id, player_count)
+
+
+async def get_least_played_games(server_id: str, player_count: int) -> List[GameWithPlayHistory]:
+    return await _run(database.get_least_played_games, server_id, player_count)
+
+
+async def log_game_selection(game_id: int, date: Optional[datetime] = None):
+    """Log the selection of a game, at `date` or now."""
+    await _run(database.log_game_selection, game_id, date)
+
+
+async def mark_game_logs_as_ignored(server_id: str, game_name: str, memory_date: Optional[datetime] = None) -> bool:
+    return await _run(database.mark_game_logs_as_ignored, server_id, game_name, memory_date)
+
+
+async def get_least_playcount_for_server(server_id: str) -> int:
+    return await _run(database.get_least_playcount_for_server, server_id)
+
+
+async def edit_game_in_db(server_id: str, current_name: str, **updates) -> bool:
+    return await _run(database.edit_game_in_db, server_id, current_name, **updates)
+
+
+async def nuke_playcounts(server_id: str) -> bool:
+    return await _run(database.nuke_playcounts, server_id)
+
+
+async def get_spin_profile(server_id: str) -> Optional[str]:
+    return await _run(database.get_spin_profile, server_id)
+
+
+async def set_spin_profile(server_id: str, spin_profile: Optional[str]):
+    await _run(database.set_spin_profile, server_id, spin_profile)
@@ -7,7 +7,7 @@ from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import and_
 
-from db.models import Base, Game, GameWithPlayHistory, GameLog
+from db.models import Base, Game, GameWithPlayHistory, GameLog, GuildSettings
 
 import logging
 
@@ -349,4 +349,22 @@ def nuke_playcounts(server_id: str) -> bool:
 
         session.commit()
 
-        return updated_logs > 0 or updated_offsets > 0
\ No newline at end of file
+        return updated_logs > 0 or updated_offsets > 0
+
+
+def get_spin_profile(server_id: str) -> Optional[str]:
+    """The server's default spin profile, or None if it hasn't chosen one."""
+    with get_session() as session:
+        settings = session.get(GuildSettings, server_id)
+        return settings.spin_profile if settings else None
+
+
+def set_spin_profile(server_id: str, spin_profile: Optional[str]):
+    """Set the server's default spin profile; None goes back to the bot's default."""
+    with get_session() as session:
+        settings = session.get(GuildSettings, server_id)
+        if settings is None:
+            settings = GuildSettings(server_id=server_id)
+            session.add(settings)
+        settings.spin_profile = spin_profile
+        session.commit()
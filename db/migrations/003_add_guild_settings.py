@@ -0,0 +1,26 @@
+"""
+Migration: Add the `guild_settings` table, for per-server preferences such
+as the default spin profile.
+
+Servers without a row use the built-in defaults.
+This migration is idempotent — safe to run multiple times.
+"""
+
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def run_migration(conn: sqlite3.Connection):
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='guild_settings'")
+    if cursor.fetchone() is None:
+        logger.info("Migration: creating 'guild_settings' table")
+        cursor.execute(
+            "CREATE TABLE guild_settings (server_id VARCHAR NOT NULL PRIMARY KEY, spin_profile VARCHAR)"
+        )
+        conn.commit()
+    else:
+        logger.debug("Migration skipped: 'guild_settings' table already present")
@@ -54,3 +54,10 @@ class GameLog(Base):
     ignored = Column(Boolean, default=False)
 
     game = relationship("Game", back_populates="logs")
+
+
+class GuildSettings(Base):
+    __tablename__ = "guild_settings"
+
+    server_id = Column(String, primary_key=True)
+    spin_profile = Column(String, nullable=True)  # default for /choosegame; None uses renderers.DEFAULT_SPIN_PROFILE
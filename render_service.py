@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Hashable, List, Optional
+
+from renderers import (
+    DEFAULT_RENDERER, DEFAULT_SPIN_PROFILE, QUALITY_TIERS, STILL_QUALITY, WheelResult, get_renderer, get_still_renderer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Worker processes that render spins, and how many more spins may wait for one
+# before new requests are turned away.
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+RENDER_QUEUE_DEPTH = int(os.environ.get("RENDER_QUEUE_DEPTH", "8"))
+# Processes each spin's frames are split across (see wheel_generator.generate_wheel_of_games).
+# Only applies to the "pil" renderer.
+RENDER_FRAME_WORKERS = int(os.environ.get("RENDER_FRAME_WORKERS", "1"))
+# How long a spin may take, queueing included, before quality is traded for
+# speed (see RenderService.choose_quality). Unset renders everything at full quality.
+LATENCY_TARGET_MS = float(os.environ["WHEEL_LATENCY_TARGET_MS"]) if os.environ.get("WHEEL_LATENCY_TARGET_MS") else None
+# Whether a spin that can't make the target at any quality may be sent as a still PNG.
+STILL_FALLBACK = os.environ.get("WHEEL_STILL_FALLBACK", "1") == "1"
+# Largest spin worth uploading, in bytes; bigger ones are re-rendered cheaper
+# (see wheel_generator.generate_wheel_of_games). Capped by each server's own upload limit.
+MAX_BYTES = int(os.environ.get("WHEEL_MAX_BYTES", 8 * 1024 * 1024))
+# Weight of the newest render time in the running averages.
+_RENDER_TIME_SMOOTHING = 0.3
+
+
+class RenderQueueFullError(Exception):
+    """Raised when a spin is requested while every worker is busy and the queue is full."""
+
+
+class RenderFailedError(Exception):
+    """Raised when a spin couldn't be rendered, e.g. because its worker process died."""
+
+
+def _warm_worker():
+    """Run once in each worker so the first real spin doesn't pay for imports and font loading."""
+    import wheel_generator
+    wheel_generator.preload_fonts()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _render(
+        games: List[str], winning_index: int, renderer: str, file_name: Optional[str], quality: Optional[str],
+        max_bytes: Optional[int], icons: Optional[List[Optional[str]]], spin_profile: str,
+) -> WheelResult:
+    if quality == STILL_QUALITY:
+        return get_still_renderer()(games, winning_index, file_name, icons=icons)
+    options = {"frame_workers": RENDER_FRAME_WORKERS, "max_bytes": max_bytes, "icons": icons,
+               "spin_profile": spin_profile} if renderer == "pil" else {}
+    if quality is not None:
+        options["quality"] = quality
+    return get_renderer(renderer)(games, winning_index, file_name, **options)
+
+
+class RenderService:
+    """
+    Renders spins in a pool of worker processes so the event loop stays free to
+    heartbeat and answer other interactions while a wheel is being drawn.
+
+    Each worker is a single-process executor of its own. Render caches live
+    in the worker process, so spins with the same affinity (a server, say)
+    go to the same worker whenever it's free, and its rerolls find their
+    labels and frames already cached; when it's busy, the least busy worker
+    takes the spin instead.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS, queue_depth: int = RENDER_QUEUE_DEPTH):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._executors: list[Optional[ProcessPoolExecutor]] = [None] * workers
+        self._worker_in_flight = [0] * workers  # spins each worker is rendering or has queued
+        self._in_flight = 0
+        # Running averages of render time in ms: per spin profile and quality, and of every render
+        self._render_ms: dict[tuple[str, str], float] = {}
+        self._recent_ms: Optional[float] = None
+
+    @property
+    def waiting(self) -> int:
+        """Spins queued behind the ones currently rendering."""
+        return max(0, self._in_flight - self.workers)
+
+    @property
+    def idle_workers(self) -> int:
+        """Workers with nothing to render right now."""
+        return max(0, self.workers - self._in_flight)
+
+    def _release(self, loop: asyncio.AbstractEventLoop, worker: int):
+        """Done-callback for a submitted spin, run in the executor's thread once a worker is finished with it."""
+        def release():
+            self._in_flight -= 1
+            self._worker_in_flight[worker] -= 1
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            # The loop is already closed; so is the bot
+            pass
+
+    def _record(self, spin_profile: str, quality: str, render_ms: float):
+        def smooth(old):
+            return render_ms if old is None else old + _RENDER_TIME_SMOOTHING * (render_ms - old)
+        self._render_ms[spin_profile, quality] = smooth(self._render_ms.get((spin_profile, quality)))
+        self._recent_ms = smooth(self._recent_ms)
+
+    def expected_wait_ms(self) -> float:
+        """Roughly how long a spin requested now would queue before a worker picks it up."""
+        if self._recent_ms is None:
+            return 0.0
+        # A spin only queues when every worker is busy, behind the least busy one
+        return min(self._worker_in_flight) * self._recent_ms
+
+    def _pick_worker(self, affinity: Hashable) -> int:
+        """The worker for a spin: the one `affinity` maps to if it's idle, otherwise the least busy."""
+        preferred = hash(affinity) % self.workers
+        if self._worker_in_flight[preferred] == 0:
+            return preferred
+        return min(range(self.workers), key=lambda worker: (self._worker_in_flight[worker], worker != preferred))
+
+    def choose_quality(self, latency_target_ms: float, spin_profile: str = DEFAULT_SPIN_PROFILE,
+                       still_fallback: bool = STILL_FALLBACK) -> str:
+        """
+        The best quality tier expected to finish within `latency_target_ms`,
+        judged from the current queue and recent render times of spins with
+        `spin_profile`. A tier that hasn't been measured yet is tried, so the
+        estimates fill themselves in.
+        When even the lowest tier won't make it, a still PNG, or the lowest
+        tier if stills aren't allowed.
+        """
+        wait_ms = self.expected_wait_ms()
+        for quality in QUALITY_TIERS:
+            if wait_ms + self._render_ms.get((spin_profile, quality), 0.0) <= latency_target_ms:
+                return quality
+        return STILL_QUALITY if still_fallback else QUALITY_TIERS[-1]
+
+    def start(self):
+        """Spawn every worker up front, and replace any that were discarded."""
+        if all(executor is not None for executor in self._executors):
+            return
+
+        started = 0
+        for worker, executor in enumerate(self._executors):
+            if executor is not None:
+                continue
+            # "spawn" rather than fork: the bot process has a running event loop and
+            # threads that must not be copied into the workers.
+            executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+            # The worker is otherwise started lazily on the first submit
+            executor.submit(_ping)
+            self._executors[worker] = executor
+            started += 1
+        logger.info(f"Render service started {started} of {self.workers} workers, queue depth {self.queue_depth}")
+
+    def shutdown(self):
+        for worker, executor in enumerate(self._executors):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executors[worker] = None
+
+    def _discard(self, worker: int, executor: ProcessPoolExecutor):
+        """Drop a worker that died; its executor refuses all further work, so start() replaces it."""
+        if self._executors[worker] is executor:
+            logger.warning(f"Render worker {worker} died, restarting it")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executors[worker] = None
+
+    async def render(
+            self,
+            games: List[str],
+            winning_index: int,
+            renderer: str = DEFAULT_RENDERER,
+            file_name: Optional[str] = None,
+            latency_target_ms: Optional[float] = None,
+            max_bytes: Optional[int] = None,
+            icons: Optional[List[Optional[str]]] = None,
+            spin_profile: str = DEFAULT_SPIN_PROFILE,
+            affinity: Hashable = None,
+    ) -> WheelResult:
+        """
+        Render a spin in a worker process. Raises RenderQueueFullError if the
+        queue is full, and RenderFailedError if the spin couldn't be rendered.
+
+        With a `latency_target_ms`, the "pil" renderer drops to a cheaper
+        quality tier, or a still, when the full spin wouldn't arrive in time.
+        With `max_bytes` it trades quality for size until the spin fits.
+        `icons` are banner URLs to show on the slices where the "pil"
+        renderer has them cached, and `spin_profile` is how long its spin is.
+        Spins with the same `affinity` share a worker, and its caches, where
+        possible; by default, spins of the same games do.
+        """
+        if self._in_flight >= self.workers + self.queue_depth:
+            raise RenderQueueFullError(f"{self._in_flight} spins already rendering or queued")
+
+        quality = None
+        if latency_target_ms is not None and renderer == DEFAULT_RENDERER:
+            quality = self.choose_quality(latency_target_ms, spin_profile)
+            if quality != QUALITY_TIERS[0]:
+                logger.info(f"Rendering at {quality} quality to meet {latency_target_ms:.0f}ms "
+                            f"({self.waiting} spins waiting)")
+
+        self.start()
+        worker = self._pick_worker(tuple(games) if affinity is None else affinity)
+        executor = self._executors[worker]
+        loop = asyncio.get_running_loop()
+        try:
+            job = executor.submit(
+                _render, games, winning_index, renderer, file_name, quality, max_bytes, icons, spin_profile,
+            )
+            # A spin counts against the workers until its worker is done with it,
+            # not until the caller stops waiting: cancelling the caller only
+            # drops a spin that's still queued, one already rendering runs on.
+            self._in_flight += 1
+            self._worker_in_flight[worker] += 1
+            job.add_done_callback(lambda _: self._release(loop, worker))
+            result = await asyncio.wrap_future(job)
+        except BrokenProcessPool as e:
+            self._discard(worker, executor)
+            raise RenderFailedError("The render worker died") from e
+        except Exception as e:
+            raise RenderFailedError(f"Rendering failed: {e}") from e
+        if renderer == DEFAULT_RENDERER:
+            self._record(spin_profile, result.quality, result.timings["total_ms"])
+        return result
+
+
+render_service = RenderService()
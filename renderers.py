@@ -0,0 +1,66 @@
+import importlib
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# Wheel renderers by name, and the module providing each one's
+# generate_wheel_of_games. Modules are only imported when a renderer is first
+# used, so the bot process never loads NumPy or matplotlib itself.
+RENDERERS = {
+    "pil": "wheel_generator",
+    "legacy": "wheel_generator_legacy",
+}
+DEFAULT_RENDERER = "pil"
+LEGACY_RENDERER = "legacy"
+
+# Most games a spin may have; larger rosters are sampled down first. Past
+# LARGE_WHEEL_GAMES in wheel_generator the "pil" renderer switches to
+# large-wheel drawing; the legacy one has no such mode, so it keeps the old limit.
+MAX_WHEEL_GAMES = 150
+LEGACY_MAX_WHEEL_GAMES = 25
+
+# Quality tiers the "pil" renderer offers, best first (see
+# wheel_generator.QUALITY_TIERS), and the single-frame PNG fallback.
+QUALITY_TIERS = ("full", "reduced", "low")
+STILL_QUALITY = "still"
+
+# Spin profiles the "pil" renderer offers, longest first (see
+# wheel_generator.SPIN_PROFILES). Servers pick their own default with /spinprofile.
+SPIN_PROFILES = ("standard", "short", "instant")
+DEFAULT_SPIN_PROFILE = "standard"
+
+
+@dataclass
+class WheelResult:
+    """A rendered spin, with everything callers need without re-decoding the GIF."""
+    data: bytes
+    duration: float  # seconds, including the hold on the final frame
+    frame_count: int
+    winning_angle: float  # degrees the wheel comes to rest at
+    timings: dict[str, float] = field(default_factory=dict)  # milliseconds per phase
+    frame_cache: dict[str, int] = field(default_factory=dict)  # stats of the rendering process's frame cache
+    format: str = "gif"  # file extension: "gif", or "png" for a still
+    quality: str = "full"  # tier it was rendered at, see QUALITY_TIERS
+    settings: dict[str, int] = field(default_factory=dict)  # exact render settings, see wheel_generator.Quality
+    max_bytes: Optional[int] = None  # byte budget it was rendered to fit, if any
+    spin_profile: str = DEFAULT_SPIN_PROFILE  # how the wheel moved, see SPIN_PROFILES
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+
+
+def max_wheel_games(renderer: str) -> int:
+    """How many games renderer `renderer` can put on one wheel."""
+    return LEGACY_MAX_WHEEL_GAMES if renderer == LEGACY_RENDERER else MAX_WHEEL_GAMES
+
+
+def get_renderer(name: str) -> Callable[..., WheelResult]:
+    """The generate_wheel_of_games function of renderer `name`, importing its module on first use."""
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer {name!r}, expected one of {tuple(RENDERERS)}")
+    return importlib.import_module(RENDERERS[name]).generate_wheel_of_games
+
+
+def get_still_renderer() -> Callable[..., WheelResult]:
+    """The "pil" renderer's single-frame PNG fallback, wheel_generator.render_still."""
+    return importlib.import_module(RENDERERS[DEFAULT_RENDERER]).render_still
@@ -1,10 +1,32 @@
-from wheel_generator import generate_wheel_of_games, calculate_gif_duration
+import random
+
+from wheel_generator import clear_caches, generate_wheel_of_games, RENDER_MODES
 
 games = ["Minecraft", "Among Us", "Rocket League", "Stardew Valley",
          "Overwatch", "Hades", "Deep Rock Galactic", "It Takes Two"]
 
 winning_index = 3
-generate_wheel_of_games(games, winning_index=winning_index, file_name="test_wheel.gif")
-duration = calculate_gif_duration("test_wheel.gif")
-print(f"Generated test_wheel.gif — winner: '{games[winning_index]}', duration: {duration:.1f}s")
 
+# Before/after: render the same wheel with every mode and compare wall time.
+# Caches are emptied before every render, so none reuses another's frames.
+for mode in RENDER_MODES:
+    clear_caches()
+    file_name = f"test_wheel_{mode}.gif"
+    result = generate_wheel_of_games(games, winning_index=winning_index, file_name=file_name, render_mode=mode)
+    print(f"[{mode}] Generated {file_name} — winner: '{games[winning_index]}', "
+          f"duration: {result.duration:.1f}s, rendered in {result.timings['total_ms'] / 1000:.2f}s")
+
+# Fixed vs adaptive frame timing across wheel sizes.
+all_games = games + ["Portal 2", "Terraria", "Valheim", "Lethal Company", "Phasmophobia",
+                     "Golf With Your Friends", "Fall Guys", "Jackbox Party Pack", "Sea of Thieves",
+                     "Borderlands 3", "Risk of Rain 2", "Left 4 Dead 2", "Gang Beasts",
+                     "Raft", "Overcooked! 2", "Barotrauma", "Content Warning"]
+for count in (2, 8, 25):
+    for adaptive in (False, True):
+        random.seed(count)
+        clear_caches()
+        file_name = f"test_wheel_{count}.gif"
+        result = generate_wheel_of_games(all_games[:count], winning_index=0, file_name=file_name,
+                                         adaptive_timing=adaptive)
+        print(f"[{count} games, {'adaptive' if adaptive else 'fixed'}] {result.frame_count} frames, "
+              f"duration: {result.duration:.2f}s, rendered in {result.timings['total_ms'] / 1000:.2f}s")
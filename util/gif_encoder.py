@@ -0,0 +1,220 @@
+import struct
+from typing import BinaryIO, Callable, Hashable, Union
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+# Fraction of a delta frame's bounding box that may change before marking the
+# unchanged pixels transparent stops shrinking the encoded frame.
+_TRANSPARENCY_MAX_CHANGED = 0.1
+
+# With a frame count and a size limit, GifWriter gives up once this many
+# frames project a total over the limit. Frames of one spin come out within
+# a few percent of each other, so the projection lands within about 1%.
+_PROJECTION_MIN_FRAMES = 8
+
+# A frame, or a callable that draws it when it's actually needed.
+FrameSource = Union[np.ndarray, Callable[[], np.ndarray]]
+
+
+class GifSizeLimitError(Exception):
+    """Raised by GifWriter as soon as the GIF is certain to end up larger than its `max_bytes`."""
+
+    def __init__(self, bytes_written: int, frames_written: int, projected_bytes: int | None = None):
+        super().__init__(f"GIF over its size limit after {frames_written} frames ({bytes_written} bytes"
+                         + (f", about {projected_bytes} in all)" if projected_bytes is not None else ")"))
+        self.bytes_written = bytes_written
+        self.frames_written = frames_written
+        # Estimated size of the whole GIF, when the writer knew how many frames were coming
+        self.projected_bytes = projected_bytes
+
+
+class GifWriter:
+    """
+    Streams palette-indexed frames to `fp` as an animated GIF with a single
+    global colour table. The header goes out with the first frame and each
+    frame is written as soon as the next one arrives, so memory stays at
+    two frames however long the animation is.
+
+    Every frame is a 2D uint8 array of indices into `palette` (a flat RGB
+    list of at most 255 entries). The first frame is stored whole; each later
+    frame is cropped to the bounding box of pixels that changed since the
+    previous one, so static areas like the needle and the background corners
+    are never re-encoded; when only a small part of that box changed, the
+    unchanged pixels are set to a reserved transparent index as well.
+    Identical consecutive frames collapse into one frame with their
+    durations summed, which is why one frame is always held back until
+    the next arrives or close() is called.
+
+    Frames may be given a `key` that identifies their content, with a
+    `block_cache` (anything with get/put, such as util.lru_cache.SizedLRUCache)
+    to keep encoded image blocks in. A frame whose block was already encoded
+    after the same previous frame is copied from the cache, and since
+    frames may then be passed as zero-argument callables, isn't even drawn.
+    Keyed frames are compared by key alone; one that turns out to repeat
+    the previous frame's pixels is written as a single transparent pixel.
+
+    With `max_bytes`, writing stops with GifSizeLimitError once the output
+    (trailer included) can no longer fit, so an oversized GIF costs only
+    the frames up to that point. Given `frame_count`, the number of frames
+    that will be added, it also stops once the bytes per frame so far
+    project a total over the limit, after only the first few frames.
+    """
+
+    def __init__(self, fp: BinaryIO, palette: list[int], loop: int = 0, block_cache=None,
+                 max_bytes: int | None = None, frame_count: int | None = None):
+        colour_count = len(palette) // 3
+        if colour_count > 255:
+            raise ValueError("Palette must leave one free entry for the transparent index")
+        self.fp = fp
+        self.palette = palette
+        self.loop = loop
+        self.transparency = colour_count
+        self.block_cache = block_cache
+        self.max_bytes = max_bytes
+        self.frame_count = frame_count
+        self.bytes_written = 0
+        self.frames_written = 0
+        self.blocks_reused = 0
+        self._previous = None  # last frame written, fully composited
+        self._previous_key = None
+        self._pending = None  # frame held back until we know whether the next one repeats it
+        self._pending_key = None
+        self._pending_duration = 0
+        self._pending_count = 0  # frames added that the pending frame stands for
+        self._frames_covered = 0  # frames added that are already written
+
+    def add_frame(self, frame: FrameSource, duration: int, key: Hashable = None) -> None:
+        """Queue a frame to be shown for `duration` milliseconds."""
+        if key is None:
+            # Without a key the pixels are needed to spot repeats; draw them once
+            frame = _resolve(frame)
+        if self._pending is None:
+            frame = _resolve(frame)
+            self._write(_header(frame.shape, self.palette, self.loop))
+        elif self._repeats_pending(frame, key):
+            self._pending_duration += duration
+            self._pending_count += 1
+            return
+        else:
+            self._flush()
+        self._pending, self._pending_key, self._pending_duration = frame, key, duration
+        self._pending_count = 1
+
+    def close(self) -> int:
+        """Write the held-back frame and the trailer. Returns the number of frames written."""
+        if self._pending is None:
+            raise ValueError("Cannot encode a GIF with no frames")
+        self._flush()
+        self._pending = None
+        # Room for the trailer was kept by _write
+        self.fp.write(b";")
+        self.bytes_written += 1
+        return self.frames_written
+
+    def _repeats_pending(self, frame: FrameSource, key: Hashable) -> bool:
+        if key is not None and self._pending_key is not None:
+            return key == self._pending_key
+        self._pending = _resolve(self._pending)
+        return np.array_equal(_resolve(frame), self._pending)
+
+    def _flush(self) -> None:
+        cache_key = None
+        if self.block_cache is not None and self._pending_key is not None and (
+            self._previous is None or self._previous_key is not None
+        ):
+            cache_key = (self._previous_key, self._pending_key)
+            block = self.block_cache.get(cache_key)
+            if block is not None:
+                self.blocks_reused += 1
+                self._write_block(block)
+                return
+
+        self._pending = _resolve(self._pending)
+        self._previous = _resolve(self._previous)
+        block = _encode_frame(self._pending, self._previous, self.transparency)
+        if cache_key is not None:
+            self.block_cache.put(cache_key, block)
+        self._write_block(block)
+
+    def _write_block(self, block: tuple[bool, bytes]) -> None:
+        use_transparency, data = block
+        # Disposal 1 leaves each frame in place for the next delta to draw over.
+        flags = (1 << 2) | (1 if use_transparency else 0)
+        self._previous, self._previous_key = self._pending, self._pending_key
+        self.frames_written += 1
+        self._frames_covered += self._pending_count
+        self._write(
+            b"!\xf9\x04" + struct.pack("<BHB", flags, round(self._pending_duration / 10), self.transparency) + b"\x00"
+            + data
+        )
+        if self.max_bytes is not None and self._frames_covered >= _PROJECTION_MIN_FRAMES:
+            projected = self.projected_bytes()
+            if projected is not None and projected > self.max_bytes:
+                raise GifSizeLimitError(self.bytes_written, self.frames_written, projected)
+
+    def projected_bytes(self) -> int | None:
+        """Estimated size of the finished GIF, or None without a `frame_count` or any frames written."""
+        if self.frame_count is None or not self._frames_covered:
+            return None
+        return round(self.bytes_written * max(self.frame_count, self._frames_covered) / self._frames_covered) + 1
+
+    def _write(self, data: bytes) -> None:
+        self.fp.write(data)
+        self.bytes_written += len(data)
+        # The one-byte trailer is always still to come
+        if self.max_bytes is not None and self.bytes_written + 1 > self.max_bytes:
+            raise GifSizeLimitError(self.bytes_written, self.frames_written, self.projected_bytes())
+
+
+def _header(shape: tuple[int, int], palette: list[int], loop: int) -> bytes:
+    """The GIF89a header, global colour table and looping extension."""
+    height, width = shape
+    # Table size is a power of two, with room for the transparent index.
+    table_bits = max(1, (len(palette) // 3).bit_length())
+    table = bytes(palette) + bytes(3 * (1 << table_bits) - len(palette))
+
+    return (
+        b"GIF89a" + struct.pack("<HHBBB", width, height, 0x80 | (table_bits - 1), 0, 0)
+        + table
+        + b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00"
+    )
+
+
+def _resolve(frame: FrameSource | None) -> np.ndarray | None:
+    return frame() if callable(frame) else frame
+
+
+def _encode_frame(frame: np.ndarray, previous: np.ndarray | None, transparency: int) -> tuple[bool, bytes]:
+    """
+    Encode one frame's image block (descriptor and LZW data) as a delta
+    against `previous`. Returns whether the block uses the transparent index,
+    which the graphic control extension needs, and the block itself.
+    """
+    offset = (0, 0)
+    if previous is not None:
+        changed = frame != previous
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        if rows.size == 0:
+            # Same pixels under a different key: the previous frame already
+            # shows them, so a single transparent pixel is all it takes.
+            frame = np.full((1, 1), transparency, dtype=np.uint8)
+            return True, b"".join(GifImagePlugin.getdata(Image.fromarray(frame), offset))
+        top, bottom = rows[0], rows[-1] + 1
+        left, right = cols[0], cols[-1] + 1
+        changed = changed[top:bottom, left:right]
+        frame = frame[top:bottom, left:right]
+        offset = (int(left), int(top))
+        # Transparent holes only pay off when most of the box is unchanged;
+        # otherwise they break up the runs LZW would have found anyway.
+        use_transparency = changed.mean() <= _TRANSPARENCY_MAX_CHANGED
+        if use_transparency:
+            frame = np.where(changed, frame, transparency).astype(np.uint8)
+        else:
+            frame = np.ascontiguousarray(frame)
+    else:
+        use_transparency = False
+
+    # No encoder params, so Pillow emits just the image descriptor and LZW data.
+    return use_transparency, b"".join(GifImagePlugin.getdata(Image.fromarray(frame), offset))
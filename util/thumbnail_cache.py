@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import io
+import ipaddress
+import logging
+import os
+import socket
+import tempfile
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Where banner thumbnails are kept, and how much disk they may take up in total.
+THUMBNAIL_CACHE_DIR = os.environ.get("THUMBNAIL_CACHE_DIR", os.path.join(os.getcwd(), "config", "thumbnails"))
+THUMBNAIL_CACHE_BYTES = int(os.environ.get("THUMBNAIL_CACHE_BYTES", 16 * 1024 * 1024))
+
+# Box every banner is downscaled to fit, and the colours it is reduced to.
+THUMBNAIL_SIZE = (96, 48)
+THUMBNAIL_COLOURS = 16
+# Banners are skipped rather than downloaded past this size.
+MAX_DOWNLOAD_BYTES = 8 * 1024 * 1024
+FETCH_TIMEOUT_S = 10
+FETCH_CONCURRENCY = 4
+MAX_REDIRECTS = 3
+# A banner that couldn't be fetched or read isn't tried again for this long.
+FAILED_RETRY_S = 60 * 60
+
+
+class ThumbnailCache:
+    """
+    Small, palette-reduced copies of game banners on disk: one PNG per
+    banner URL, named after a hash of the URL, with at most `max_bytes` of
+    them in total. The least recently used are deleted first; reading a
+    thumbnail counts as using it.
+
+    Spins only ever read from the cache (see get), so a missing or slow
+    banner never holds one up; fetch_thumbnails fills it in the background,
+    and remembers in memory which URLs failed so they aren't fetched again
+    on every spin.
+    Pillow is only imported to store a thumbnail, so the bot process can
+    import this module without it.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._failed: dict[str, float] = {}  # URL -> when fetching it last failed
+
+    def path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest() + ".png")
+
+    def __contains__(self, url: str) -> bool:
+        return os.path.exists(self.path(url))
+
+    def get(self, url: str) -> Optional[bytes]:
+        """The PNG thumbnail for `url`, marked as just used, or None if it isn't cached."""
+        path = self.path(url)
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+            os.utime(path)
+        except OSError:
+            # Not cached, or trimmed away just now
+            return None
+        return data
+
+    def put(self, url: str, data: bytes) -> None:
+        """
+        Store a thumbnail of the image in `data` for `url`, then trim the
+        cache back to size. Raises whatever Pillow raises if `data` isn't an
+        image it can read.
+        """
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            # JPEGs can be decoded straight at a fraction of their size
+            image.draft("RGB", THUMBNAIL_SIZE)
+            thumbnail = image.convert("RGB")
+        thumbnail.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
+        thumbnail = thumbnail.quantize(THUMBNAIL_COLOURS)
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Written under a temporary name and renamed, so nobody reads half a file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                thumbnail.save(fp, format="PNG", optimize=True)
+            os.replace(temp_path, self.path(url))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.trim()
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(last used, size, path) of every thumbnail."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".png"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def trim(self) -> None:
+        """Delete the least recently used thumbnails until the rest fit in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def mark_failed(self, url: str) -> None:
+        self._failed[url] = time.monotonic()
+
+    def recently_failed(self, url: str) -> bool:
+        """Whether fetching `url` failed less than FAILED_RETRY_S ago."""
+        now = time.monotonic()
+        for failed_url, failed_at in list(self._failed.items()):
+            if now - failed_at >= FAILED_RETRY_S:
+                del self._failed[failed_url]
+        return url in self._failed
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
+
+
+def _check_address(host: str) -> None:
+    """Raise ValueError unless the IP address `host` is a public one."""
+    address = ipaddress.ip_address(host.split("%", 1)[0])
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    if not address.is_global:
+        raise ValueError(f"{host} is not a public address")
+
+
+def _check_url(url, allow_private_hosts: bool) -> None:
+    """Raise ValueError unless `url` (a yarl.URL) is http(s) and, if its host is an IP address, a public one."""
+    if url.scheme not in ("http", "https") or not url.host:
+        raise ValueError("not an http(s) URL")
+    if allow_private_hosts:
+        return
+    try:
+        # Parsed the way the socket layer will, so forms like 2130706433 count as addresses too
+        addresses = socket.getaddrinfo(url.host, None, flags=socket.AI_NUMERICHOST)
+    except socket.gaierror:
+        # A host name; the connector's resolver checks what it resolves to
+        return
+    for *_, sockaddr in addresses:
+        _check_address(sockaddr[0])
+
+
+def _connector(allow_private_hosts: bool):
+    """
+    An aiohttp connector whose resolver refuses host names that resolve to
+    loopback, private, link-local or other non-public addresses. Checking
+    at connect time means the address connected to is the one checked.
+    """
+    import aiohttp
+
+    if allow_private_hosts:
+        return aiohttp.TCPConnector()
+
+    class PublicResolver(aiohttp.ThreadedResolver):
+        async def resolve(self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET):
+            addresses = await super().resolve(host, port, family)
+            for address in addresses:
+                _check_address(address["host"])
+            return addresses
+
+    return aiohttp.TCPConnector(resolver=PublicResolver())
+
+
+async def _download(session, url: str, allow_private_hosts: bool) -> bytes:
+    import aiohttp
+    from yarl import URL
+
+    url = URL(url)
+    # Redirects are followed here rather than by aiohttp, so each hop is checked
+    for _ in range(MAX_REDIRECTS + 1):
+        _check_url(url, allow_private_hosts)
+        async with session.get(url, allow_redirects=False,
+                               timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT_S)) as response:
+            if response.status in (301, 302, 303, 307, 308) and "Location" in response.headers:
+                url = response.url.join(URL(response.headers["Location"]))
+                continue
+            if response.status != 200:
+                raise ValueError(f"HTTP {response.status}")
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                size += len(chunk)
+                if size > MAX_DOWNLOAD_BYTES:
+                    raise ValueError(f"larger than {MAX_DOWNLOAD_BYTES} bytes")
+                chunks.append(chunk)
+            return b"".join(chunks)
+    raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+
+
+async def fetch_thumbnails(cache: ThumbnailCache, urls: Iterable[Optional[str]],
+                           allow_private_hosts: bool = False) -> int:
+    """
+    Download and store a thumbnail for every URL in `urls` that isn't cached
+    yet; empty ones are ignored. Returns how many were added. A banner that
+    can't be fetched or read is logged and skipped for FAILED_RETRY_S, and
+    its game keeps showing its name. Decoding runs in a thread, off the
+    event loop.
+
+    Banner links come from server members, so only http(s) URLs on public
+    addresses are fetched, redirects included. `allow_private_hosts` lifts
+    the address check, for a test server on this machine.
+    """
+    import aiohttp
+
+    missing = [url for url in dict.fromkeys(urls)
+               if url and url not in cache and not cache.recently_failed(url)]
+    if not missing:
+        return 0
+    limit = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch(session, url: str) -> bool:
+        async with limit:
+            try:
+                data = await _download(session, url, allow_private_hosts)
+                await asyncio.to_thread(cache.put, url, data)
+            except Exception as e:
+                logger.warning(f"Couldn't cache a thumbnail of {url}: {e}")
+                cache.mark_failed(url)
+                return False
+        return True
+
+    async with aiohttp.ClientSession(connector=_connector(allow_private_hosts)) as session:
+        added = await asyncio.gather(*(fetch(session, url) for url in missing))
+    logger.debug(f"Cached {sum(added)} of {len(missing)} new thumbnails, cache now {cache.stats()}")
+    return sum(added)
+
+
+thumbnail_cache = ThumbnailCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_BYTES)
+_prefetches: set[asyncio.Task] = set()
+
+
+def prefetch_thumbnails(urls: Iterable[Optional[str]]) -> None:
+    """Start filling thumbnail_cache with `urls` in the background; needs a running event loop."""
+    task = asyncio.get_running_loop().create_task(fetch_thumbnails(thumbnail_cache, list(urls)))
+    # The loop only keeps weak references to tasks
+    _prefetches.add(task)
+    task.add_done_callback(_prefetches.discard)
@@ -3,9 +3,24 @@ import math
 import random
 import io
 import logging
+import functools
+import collections
+import contextlib
+import multiprocessing
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from renderers import QUALITY_TIERS as RENDERER_QUALITY_TIERS, SPIN_PROFILES as RENDERER_SPIN_PROFILES
+from renderers import DEFAULT_SPIN_PROFILE, STILL_QUALITY, WheelResult
+from util.gif_encoder import GifSizeLimitError, GifWriter
+from util.lru_cache import SizedLRUCache
+from util.thumbnail_cache import THUMBNAIL_SIZE, thumbnail_cache
+
 logger = logging.getLogger(__name__)
 
 # --- Constants ---
@@ -14,7 +29,42 @@ CENTRE = SIZE // 2
 RADIUS = 260         # Wheel radius
 NEEDLE_DIST = RADIUS + 20   # Distance from centre to needle tip
 FONT_SIZE = 16  # base — overridden dynamically per render based on game count
+MIN_FONT_SIZE = 13
+MAX_FONT_SIZE = 22
+SCALED_MIN_FONT_SIZE = 8  # floor once a font is scaled down with a smaller canvas
 FRAME_DURATION_MS = 40  # ~25fps
+HOLD_DURATION_MS = 2400  # how long the final frame lingers before the GIF loops
+
+# Adaptive timing: in the deceleration tail, frames that move the wheel less
+# than this are dropped and their time given to the previous frame, up to a
+# cap so the final creep still reads as motion.
+ADAPTIVE_MIN_STEP_DEG = 1.5
+ADAPTIVE_MAX_FRAME_MS = 200
+
+# Wheels with more games than this are drawn as large wheels: a bigger canvas,
+# the "polar" renderer whatever the render mode, and labels sized to fit their
+# slices, some left off once the slices get too thin (see _wheel_labels).
+LARGE_WHEEL_GAMES = 25
+LARGE_WHEEL_SCALE = 4 / 3  # canvas size relative to the quality tier's
+LARGE_MIN_FONT_SIZE = 9  # smallest label on a large wheel; thinner slices lose labels instead
+_LABEL_FILL = 0.85  # share of a slice's thickness a large wheel's font may take up
+_LABEL_RIM_MARGIN = 6  # px kept between an abbreviated label and the rim
+# A large wheel's hub covers the centre out to where wedges are this many px
+# wide, but no more than this fraction of the radius.
+_HUB_WEDGE_PX = 3
+_HUB_MAX_RADIUS = 0.3
+
+# Game icons: largest size on the full-size wheel, and smallest across a slice
+# before the game's name is shown instead.
+ICON_SIZE = THUMBNAIL_SIZE
+MIN_ICON_HEIGHT = 12
+
+# "classic" redraws every wedge and label per frame; "cached" draws the wheel
+# once per spin and rotates that bitmap for each frame; "polar" unwraps it
+# into a texture and gathers each frame with NumPy. "polar" is the fastest,
+# but its bilinear sampling makes GIFs some 15-30% larger than the others.
+RENDER_MODES = ("classic", "cached", "polar")
+DEFAULT_RENDER_MODE = os.environ.get("WHEEL_RENDER_MODE", "cached")
 
 # Visually distinct palette — warm/cool alternating to avoid adjacent clashes
 _PALETTE = [
@@ -32,6 +82,182 @@ _PALETTE = [
     (14,  165, 233),  # sky
 ]
 
+# Fixed colours drawn around the slices; the global palette is built from these.
+_BACKGROUND = (32, 32, 36)
+_RIM = (80, 80, 88)
+_TEXT = (255, 255, 255)
+_TEXT_SHADOW_ALPHA = 180
+_NEEDLE = (220, 30, 30)
+_NEEDLE_OUTLINE = (200, 200, 200)
+
+_LABEL_PAD = 12  # transparent margin around each label surface, so rotation never clips it
+_LABEL_RADIUS = 0.68  # labels are centred this fraction of the radius out from the centre
+# Where the label shadow is drawn relative to the text, most important first.
+_SHADOW_OFFSETS = [(-1, -1), (1, -1), (-1, 1), (1, 1), (0, 2), (2, 0)]
+
+
+@dataclass(frozen=True)
+class Quality:
+    """Settings a spin can give up to render faster; see QUALITY_TIERS."""
+    size: int = SIZE  # canvas side in pixels; the wheel and labels scale with it
+    frame_stride: int = 1  # render every n-th frame, each shown n times as long
+    shadow_passes: int = len(_SHADOW_OFFSETS)  # label shadow copies, of _SHADOW_OFFSETS
+    palette_size: int = 255  # colours in the GIF palette; anti-aliasing ramps go first
+
+    @property
+    def radius(self) -> int:
+        return round(RADIUS * self.size / SIZE)
+
+
+# Named tiers, best first. Names match renderers.QUALITY_TIERS.
+QUALITY_TIERS = {
+    "full": Quality(),
+    "reduced": Quality(size=480, frame_stride=2, shadow_passes=4, palette_size=128),
+    "low": Quality(size=360, frame_stride=3, shadow_passes=2, palette_size=64),
+}
+
+
+@dataclass(frozen=True)
+class SpinProfile:
+    """How a spin moves: its easing, how many turns it makes and how long it rests on the result."""
+    max_speed: int = 30  # degrees per frame at full speed
+    accel_frames: int = 20
+    decel_frames: int = 220
+    min_rotations: int = 4  # full turns before the landing, picked at random from [min, max)
+    max_rotations: int = 8
+    hold_ms: int = HOLD_DURATION_MS
+
+
+# Named spin profiles, longest first. Names match renderers.SPIN_PROFILES.
+# Shorter spins have fewer frames to render and encode, and keep the channel
+# waiting for the result for less time.
+SPIN_PROFILES = {
+    "standard": SpinProfile(),
+    "short": SpinProfile(accel_frames=12, decel_frames=80, min_rotations=2, max_rotations=4, hold_ms=1600),
+    "instant": SpinProfile(max_speed=45, accel_frames=5, decel_frames=24, min_rotations=1, max_rotations=2,
+                           hold_ms=800),
+}
+
+
+def _check_names(what: str, named: dict, listed: tuple[str, ...]) -> None:
+    """
+    renderers lists the same names for the bot process, which never imports
+    this module; refuse to load rather than let /spinprofile or the quality
+    tiers disagree with what the renderer accepts.
+    """
+    if tuple(named) != listed:
+        raise RuntimeError(f"wheel_generator.{what} {tuple(named)} doesn't match renderers.{what} {listed}")
+
+
+_check_names("QUALITY_TIERS", QUALITY_TIERS, RENDERER_QUALITY_TIERS)
+_check_names("SPIN_PROFILES", SPIN_PROFILES, RENDERER_SPIN_PROFILES)
+
+
+# Cheaper settings tried, in this order, when a spin comes out over its byte
+# budget: smaller palettes, then fewer frames, then a smaller canvas, each step
+# keeping the ones before it. A still is the last resort.
+_BUDGET_PALETTE_SIZES = (63, 31)
+_BUDGET_FRAME_STRIDES = (2, 3)
+_BUDGET_SIZE_SCALES = (0.8, 0.6)  # of the canvas the spin started at
+# Fraction of the budget an estimated size must fit in for that step to be tried.
+_BUDGET_MARGIN = 0.9
+# A still that is itself over budget is redrawn this much smaller each time,
+# down to a canvas no smaller than _STILL_MIN_SIZE.
+_STILL_SIZE_SCALE = 0.8
+_STILL_MIN_SIZE = 120
+
+
+def _quality(name: str) -> Quality:
+    if name not in QUALITY_TIERS:
+        raise ValueError(f"Unknown quality {name!r}, expected one of {tuple(QUALITY_TIERS)}")
+    return QUALITY_TIERS[name]
+
+
+def _spin_profile(name: str) -> SpinProfile:
+    if name not in SPIN_PROFILES:
+        raise ValueError(f"Unknown spin profile {name!r}, expected one of {tuple(SPIN_PROFILES)}")
+    return SPIN_PROFILES[name]
+
+
+def _budget_steps(settings: Quality) -> list[Quality]:
+    """Ever cheaper versions of `settings` to fall back on when a spin is over its byte budget."""
+    steps = []
+    start_size = settings.size
+    for palette_size in _BUDGET_PALETTE_SIZES:
+        if palette_size < settings.palette_size:
+            settings = replace(settings, palette_size=palette_size)
+            steps.append(settings)
+    for frame_stride in _BUDGET_FRAME_STRIDES:
+        if frame_stride > settings.frame_stride:
+            settings = replace(settings, frame_stride=frame_stride)
+            steps.append(settings)
+    for scale in _BUDGET_SIZE_SCALES:
+        size = round(start_size * scale)
+        if size < settings.size:
+            settings = replace(settings, size=size)
+            steps.append(settings)
+    return steps
+
+
+def _estimate_bytes(measured_bytes: float, measured: Quality, candidate: Quality, colours: list) -> float:
+    """
+    Rough size of a spin at `candidate` settings, given its size at
+    `measured`. The encoded size goes about with log2 of the colours in use
+    and with the number of frames, and with the canvas side to the power
+    1.5: the wheel's area grows faster than the part of it that changes.
+    """
+    def colour_bits(settings: Quality) -> float:
+        return math.log2(len(_build_palette(colours, settings.palette_size).getpalette()) // 3)
+
+    return (measured_bytes
+            * colour_bits(candidate) / colour_bits(measured)
+            * measured.frame_stride / candidate.frame_stride
+            * (candidate.size / measured.size) ** 1.5)
+
+
+def _winning_rotation(game_count: int, winning_index: int) -> float:
+    """A random resting angle that puts the needle (at 3 o'clock) inside the winning slice, clear of its edges."""
+    slice_deg = 360.0 / game_count
+    winning_max = 360 - (winning_index * slice_deg + 1)
+    winning_min = winning_max - (slice_deg - 2)
+    return random.uniform(winning_min, winning_max)
+
+
+class _PhaseTimer:
+    """
+    Accumulates wall time per named phase of a spin, for `--profile`. Phases
+    nest; each one is charged only the time not spent in the phases inside
+    it, so the totals add up to the time spent under them.
+    """
+
+    def __init__(self):
+        self.totals: dict[str, float] = collections.defaultdict(float)
+        self.calls: dict[str, int] = collections.defaultdict(int)
+        self._stack: list[list] = []  # [name, started, time spent in nested phases]
+
+    @contextlib.contextmanager
+    def __call__(self, name: str):
+        entry = [name, time.perf_counter(), 0.0]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - entry[1]
+            self.totals[name] += elapsed - entry[2]
+            self.calls[name] += 1
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+
+_phase_timer: _PhaseTimer | None = None
+_NO_PHASE = contextlib.nullcontext()
+
+
+def _phase(name: str):
+    """Time a phase when profiling; otherwise a shared no-op context."""
+    return _phase_timer(name) if _phase_timer is not None else _NO_PHASE
+
 
 def _assign_colours(n: int) -> list[tuple[int, int, int]]:
     """
@@ -60,23 +286,233 @@ def _assign_colours(n: int) -> list[tuple[int, int, int]]:
     return assigned
 
 
-def _render_frame(
+@dataclass(frozen=True)
+class _Icon:
+    """A game's cached thumbnail, drawn in place of its name, fitted to `box` (length along the slice, height across)."""
+    url: str
+    data: bytes
+    box: tuple[int, int]
+
+
+def _icon_colours(labels: list) -> list[tuple[int, int, int]]:
+    """Every colour in the thumbnails among `labels`, for the spin's palette."""
+    colours = []
+    for label in labels:
+        if isinstance(label, _Icon):
+            with Image.open(io.BytesIO(label.data)) as image:
+                colours += [colour for _, colour in image.convert("RGB").getcolors()]
+    return colours
+
+
+def _blend(a: tuple[int, int, int], b: tuple[int, int, int], t: float) -> tuple[int, int, int]:
+    """Linear blend from colour `a` towards `b` by fraction `t`."""
+    return tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+
+def _build_palette(
+    colours: list[tuple[int, int, int]], size: int = 255, extra: list[tuple[int, int, int]] = ()
+) -> Image.Image:
+    """
+    Build the fixed palette every frame of a spin is mapped onto.
+
+    All flat colours the renderer draws are known up front. Everything else
+    is anti-aliasing, which blends a slice colour towards the white label,
+    the label shadow or the wedge outline, so short ramps along those blends
+    keep edges smooth without quantising each frame. Ramps are added coarsest
+    step first, so a palette capped at `size` colours (at most 255) loses
+    the finest steps. `extra` colours, from game icons, come after the
+    coarsest ramps. Returns a 1×1 "P" image to pass to
+    `Image.quantize(palette=...)`.
+    """
+    shadow_t = _TEXT_SHADOW_ALPHA / 255
+    colours = list(dict.fromkeys(colours))
+    entries = [_BACKGROUND, _RIM, _NEEDLE, _NEEDLE_OUTLINE, _TEXT] + colours
+    # Greys cover white text over its black shadow, and the shadow ring.
+    entries += [(v, v, v) for v in range(0, 256, 51)]
+    for colour in colours:
+        entries += [_blend(colour, _TEXT, 0.4), _blend(colour, (0, 0, 0), shadow_t), _blend(colour, _BACKGROUND, 0.5)]
+    entries += extra
+    for colour in colours:
+        entries += [_blend(colour, _TEXT, 0.8), _blend(colour, (0, 0, 0), shadow_t / 2)]
+    entries += [(v, v, v) for v in range(0, 256, 17)]
+    for colour in colours:
+        entries += [_blend(colour, _TEXT, t) for t in (0.2, 0.6)]
+
+    # The encoder reserves the entry after the last colour for transparency.
+    entries = list(dict.fromkeys(entries))[:min(size, 255)]
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([v for entry in entries for v in entry])
+    return palette
+
+
+def _label_surface(label: str, font: ImageFont.FreeTypeFont, shadow_passes: int = len(_SHADOW_OFFSETS)) -> Image.Image:
+    """The shadowed label, or an _Icon, unrotated, on a transparent RGBA surface."""
+    key = (label, getattr(font, "path", None), getattr(font, "size", None), shadow_passes, None)
+    surf = _label_sprites.get(key)
+    if surf is not None:
+        return surf
+    if isinstance(label, _Icon):
+        surf = _icon_surface(label)
+        _label_sprites.put(key, surf)
+        return surf
+
+    bbox = font.getbbox(label)
+    tw = bbox[2] - bbox[0]
+    th = bbox[3] - bbox[1]
+
+    # Shadow is drawn first (offset 1px in each direction) to give
+    # strong legibility against any segment colour.
+    pad = _LABEL_PAD
+    surf = Image.new("RGBA", (tw + pad * 2, th + pad * 2), (0, 0, 0, 0))
+    sdraw = ImageDraw.Draw(surf)
+    shadow = (0, 0, 0, _TEXT_SHADOW_ALPHA)
+    for dx, dy in _SHADOW_OFFSETS[:shadow_passes]:
+        sdraw.text((pad + dx, pad + dy), label, font=font, fill=shadow)
+    sdraw.text((pad, pad), label, font=font, fill=_TEXT + (255,))
+
+    _label_sprites.put(key, surf)
+    return surf
+
+
+def _icon_surface(icon: _Icon) -> Image.Image:
+    """The icon scaled to fit its box, with a thin dark border, on a transparent surface."""
+    with Image.open(io.BytesIO(icon.data)) as image:
+        image = image.convert("RGB")
+    scale = min(icon.box[0] / image.width, icon.box[1] / image.height)
+    image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), Image.LANCZOS)
+
+    pad = _LABEL_PAD
+    surf = Image.new("RGBA", (image.width + pad * 2, image.height + pad * 2), (0, 0, 0, 0))
+    surf.paste(image, (pad, pad))
+    ImageDraw.Draw(surf).rectangle(
+        [pad - 1, pad - 1, pad + image.width, pad + image.height], outline=_BACKGROUND + (255,)
+    )
+    return surf
+
+
+def _label_sprite(label: str, font: ImageFont.FreeTypeFont, rotation: float, shadow_passes: int):
+    """
+    The label surface rotated by `rotation` degrees, rounded to
+    LABEL_ROTATION_STEP_DEG and cropped to its visible pixels. Returns the
+    sprite, the size of the uncropped rotated surface, and where the crop
+    sits inside it.
+
+    Sprites are cached per process, so each label is drawn once and only
+    rotated again for angles it hasn't been shown at, across frames and
+    across spins.
+    """
+    step = round(rotation / LABEL_ROTATION_STEP_DEG) % round(360 / LABEL_ROTATION_STEP_DEG)
+    key = (label, getattr(font, "path", None), getattr(font, "size", None), shadow_passes, step)
+    sprite = _label_sprites.get(key)
+    if sprite is not None:
+        return sprite
+
+    rotated = _label_surface(label, font, shadow_passes).rotate(
+        -step * LABEL_ROTATION_STEP_DEG, expand=True, resample=Image.BICUBIC
+    )
+    # Most of an expanded rotation is transparent corners; don't keep them.
+    left, top, right, bottom = rotated.getbbox() or (0, 0, 1, 1)
+    sprite = (rotated.crop((left, top, right, bottom)), rotated.size, (left, top))
+
+    _label_sprites.put(key, sprite)
+    return sprite
+
+
+def _draw_label(
+    img: Image.Image,
+    label: str,
+    font: ImageFont.FreeTypeFont,
+    tx: float,
+    ty: float,
+    rotation: float,
+    shadow_passes: int = len(_SHADOW_OFFSETS),
+) -> None:
+    """Draw a shadowed label centred on (tx, ty), rotated by `rotation` degrees."""
+    sprite, (width, height), (left, top) = _label_sprite(label, font, rotation, shadow_passes)
+
+    # Paste centred on the text position
+    px = int(tx - width / 2) + left
+    py = int(ty - height / 2) + top
+    img.paste(sprite, (px, py), sprite)
+
+
+def _sprite_bytes(entry) -> int:
+    image = entry[0] if isinstance(entry, tuple) else entry
+    return image.width * image.height * 4
+
+
+def _label_rotation(mid_deg: float) -> float:
+    """
+    Rotation for a label whose slice centre is at `mid_deg`: always point
+    outward from centre, flipped 180° in the left half (90–270°) so letters
+    stay right side up.
+    """
+    rotation = mid_deg  # degrees, PIL rotates anti-clockwise
+    if 90 < (mid_deg % 360) <= 270:
+        rotation += 180
+    return rotation
+
+
+def _draw_slices(
+    img: Image.Image,
     games: list[str],
     colours: list[tuple[int, int, int]],
     angle_offset_deg: float,
-    size: int,
+    cx: float,
+    cy: float,
     radius: int,
     font: ImageFont.FreeTypeFont,
-) -> Image.Image:
-    """Render a single wheel frame using PIL only (no matplotlib)."""
-    img = Image.new("RGBA", (size, size), (32, 32, 36, 255))
+    shadow_passes: int = len(_SHADOW_OFFSETS),
+) -> None:
+    """
+    Draw every wedge, then every label, onto `img`, centred on (cx, cy), so
+    a label wider than its slice isn't cut off by the next wedge. Empty
+    labels are skipped. Large wheels get a hub over the middle, where their
+    wedges are too thin to tell apart.
+    """
     draw = ImageDraw.Draw(img)
+    slice_deg = 360.0 / len(games)
+    large = len(games) > LARGE_WHEEL_GAMES
+    # Thin wedges would be all outline towards the centre
+    outline_width = 1 if large else 2
 
-    n = len(games)
-    slice_deg = 360.0 / n
-    cx, cy = size // 2, size // 2
+    for i, colour in enumerate(colours):
+        start = angle_offset_deg + i * slice_deg
+        # Draw filled arc (wedge)
+        with _phase("wedges"):
+            draw.pieslice(
+                [cx - radius, cy - radius, cx + radius, cy + radius],
+                start=start,
+                end=start + slice_deg,
+                fill=colour,
+                outline=_BACKGROUND,
+                width=outline_width,
+            )
 
-    # --- Rings drawn first so text and needle render on top ---
+    if large:
+        hub_r = min(radius * _HUB_MAX_RADIUS, len(games) * _HUB_WEDGE_PX / (2 * math.pi))
+        draw.ellipse([cx - hub_r, cy - hub_r, cx + hub_r, cy + hub_r], fill=_BACKGROUND, outline=_RIM, width=2)
+
+    for i, game in enumerate(games):
+        if not game:
+            continue
+        # --- Text label ---
+        mid_deg = angle_offset_deg + i * slice_deg + slice_deg / 2
+        mid_rad = math.radians(mid_deg)
+
+        # Text sits at 68% of the radius from centre
+        text_r = radius * _LABEL_RADIUS
+        tx = cx + text_r * math.cos(mid_rad)
+        ty = cy + text_r * math.sin(mid_rad)
+
+        # We rotate a small surface then paste it — this avoids the
+        # in-place rotation that caused the mid-animation flip bug.
+        with _phase("labels"):
+            _draw_label(img, game, font, tx, ty, _label_rotation(mid_deg), shadow_passes)
+
+
+def _draw_rings(draw: ImageDraw.ImageDraw, cx: int, cy: int, radius: int) -> None:
+    """Draw the drop-shadow ring and the outer rim."""
     shadow_r = radius + 4
     draw.ellipse(
         [cx - shadow_r, cy - shadow_r, cx + shadow_r, cy + shadow_r],
@@ -87,98 +523,356 @@ def _render_frame(
     # Outer ring drawn before slices so text renders on top of it
     draw.ellipse(
         [cx - radius, cy - radius, cx + radius, cy + radius],
-        outline=(80, 80, 88),
+        outline=_RIM,
         width=3,
     )
 
-    for i, (game, colour) in enumerate(zip(games, colours)):
-        start = angle_offset_deg + i * slice_deg
-        end = start + slice_deg
-
-        # Draw filled arc (wedge)
-        draw.pieslice(
-            [cx - radius, cy - radius, cx + radius, cy + radius],
-            start=start,
-            end=end,
-            fill=colour,
-            outline=(32, 32, 36),
-            width=2,
-        )
-
-        # --- Text label ---
-        mid_deg = start + slice_deg / 2
-        mid_rad = math.radians(mid_deg)
-
-        # Text sits at 68% of the radius from centre
-        text_r = radius * 0.68
-        tx = cx + text_r * math.cos(mid_rad)
-        ty = cy + text_r * math.sin(mid_rad)
-
-        label = game
-        fit_font = font
-        bbox = fit_font.getbbox(label)
-        tw = bbox[2] - bbox[0]
-        th = bbox[3] - bbox[1]
-
-        # Rotation: always point outward from centre, clamped so text
-        # never flips upside-down regardless of wheel position.
-        # We rotate a small surface then paste it — this avoids the
-        # in-place rotation that caused the mid-animation flip bug.
-        rotation = mid_deg  # degrees, PIL rotates anti-clockwise
-        # Keep text right-side up: if the outward direction is in the
-        # left half (90–270°), flip 180° so letters face outward.
-        if 90 < (mid_deg % 360) <= 270:
-            rotation += 180
-
-        # Draw label on a transparent surface, then rotate and paste.
-        # Shadow is drawn first (offset 1px in each direction) to give
-        # strong legibility against any segment colour.
-        pad = 12
-        surf = Image.new("RGBA", (tw + pad * 2, th + pad * 2), (0, 0, 0, 0))
-        sdraw = ImageDraw.Draw(surf)
-        shadow = (0, 0, 0, 180)
-        for dx, dy in [(-1, -1), (1, -1), (-1, 1), (1, 1), (0, 2), (2, 0)]:
-            sdraw.text((pad + dx, pad + dy), label, font=fit_font, fill=shadow)
-        sdraw.text((pad, pad), label, font=fit_font, fill=(255, 255, 255, 255))
-        rotated = surf.rotate(-rotation, expand=True, resample=Image.BICUBIC)
-
-        # Paste centred on the text position
-        px = int(tx - rotated.width / 2)
-        py = int(ty - rotated.height / 2)
-        img.paste(rotated, (px, py), rotated)
-
 
-    # --- Needle on top of everything ---
+def _draw_needle(draw: ImageDraw.ImageDraw, cx: int, cy: int, radius: int) -> None:
+    """Draw the needle at the 3 o'clock position."""
     # Tip penetrates 20px inside the wheel edge so it clearly points at a segment.
     # The base sits outside the wheel so the body is always visible.
-    tip_x = cx + radius - 20       # 20px inside the wheel edge
+    # Offsets are for the full-size wheel and scale with smaller ones.
+    scale = radius / RADIUS
+    tip_x = cx + radius - 20 * scale       # 20px inside the wheel edge
     tip_y = cy
-    base_x = cx + radius + 30      # base sits outside the rim
+    base_x = cx + radius + 30 * scale      # base sits outside the rim
     needle_pts = [
-        (base_x, tip_y - 14),   # back top
-        (base_x, tip_y + 14),   # back bottom
+        (base_x, tip_y - 14 * scale),   # back top
+        (base_x, tip_y + 14 * scale),   # back bottom
         (tip_x,  tip_y),        # tip (inside wheel)
     ]
-    draw.polygon(needle_pts, fill=(220, 30, 30), outline=(200, 200, 200), width=2)
+    draw.polygon(needle_pts, fill=_NEEDLE, outline=_NEEDLE_OUTLINE, width=2)
+
+
+def _render_frame(
+    games: list[str],
+    colours: list[tuple[int, int, int]],
+    angle_offset_deg: float,
+    size: int,
+    radius: int,
+    font: ImageFont.FreeTypeFont,
+    shadow_passes: int = len(_SHADOW_OFFSETS),
+) -> Image.Image:
+    """Render a single wheel frame using PIL only (no matplotlib)."""
+    img = Image.new("RGBA", (size, size), _BACKGROUND + (255,))
+    draw = ImageDraw.Draw(img)
+    cx, cy = size // 2, size // 2
+
+    # --- Rings drawn first so text and needle render on top ---
+    with _phase("rim"):
+        _draw_rings(draw, cx, cy, radius)
+    _draw_slices(img, games, colours, angle_offset_deg, cx, cy, radius, font, shadow_passes)
+
+    # --- Needle on top of everything ---
+    with _phase("needle"):
+        _draw_needle(draw, cx, cy, radius)
 
     return img
 
 
-def _load_font(size: int) -> ImageFont.FreeTypeFont:
-    """Try to load a TrueType font; fall back to PIL default."""
-    candidates = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-        "/System/Library/Fonts/Helvetica.ttc",
-        "/Library/Fonts/Arial Bold.ttf",
-        "arial.ttf",
-    ]
-    for path in candidates:
+# The "cached" wheel is rotated with a bilinear resample only within this many
+# degrees of where it comes to rest, where it moves slowly enough for jagged
+# labels to show. Further out, nearest-neighbour is about as cheap as a copy,
+# and keeps the already anti-aliased pixels as they are, so frames don't pick
+# up new in-between colours that cost GIF bytes.
+_SMOOTH_ROTATION_DEG = 30
+
+
+class _WheelLayers:
+    """
+    Pre-built layers for the "cached" render mode.
+
+    The wheel is a rigid body, so slices and labels are drawn once, at (or,
+    see _canonical_rest_angle, near) the angle the spin comes to rest on,
+    onto a square crop of the background.
+    Each frame rotates that crop about its centre and pastes it back through
+    a circular mask (the rings under it are round, so they survive rotation),
+    then stamps the needle on top. Labels turn with the wheel, as they would
+    on a physical one, and are upright on the final frame.
+    """
+
+    def __init__(
+        self,
+        games: list[str],
+        colours: list[tuple[int, int, int]],
+        size: int,
+        radius: int,
+        font: ImageFont.FreeTypeFont,
+        rest_angle_deg: float = 0.0,
+        shadow_passes: int = len(_SHADOW_OFFSETS),
+    ):
+        cx, cy = size // 2, size // 2
+        self.rest_angle_deg = rest_angle_deg
+
+        self.background = Image.new("RGBA", (size, size), _BACKGROUND + (255,))
+        _draw_rings(ImageDraw.Draw(self.background), cx, cy, radius)
+
+        # Wheel layer covers the shadow ring, and any label that overhangs the
+        # rim, so the mask edge lands on flat fill.
+        reach = radius + 8
+        for game in games:
+            surf = _label_surface(game, font, shadow_passes)
+            reach = max(reach, math.ceil(radius * _LABEL_RADIUS + math.hypot(surf.width / 2, surf.height / 2)))
+        side = 2 * min(reach, size // 2)
+        self.wheel_offset = (cx - side // 2, cy - side // 2)
+        # RGB rotates noticeably faster than RGBA, and everything under the
+        # mask is opaque anyway.
+        self.wheel = self.background.crop(
+            self.wheel_offset + (self.wheel_offset[0] + side, self.wheel_offset[1] + side)
+        ).convert("RGB")
+        _draw_slices(self.wheel, games, colours, rest_angle_deg, side / 2, side / 2, radius, font, shadow_passes)
+
+        self.mask = Image.new("L", (side, side), 0)
+        ImageDraw.Draw(self.mask).ellipse([1, 1, side - 2, side - 2], fill=255)
+
+        # Needle layer cropped to its bounding box so compositing stays cheap.
+        needle = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        _draw_needle(ImageDraw.Draw(needle), cx, cy, radius)
+        needle_box = needle.getbbox()
+        self.needle = needle.crop(needle_box)
+        self.needle_offset = needle_box[:2]
+
+    def render(self, angle_offset_deg: float) -> Image.Image:
+        """Compose a full frame with the wheel turned by `angle_offset_deg`."""
+        with _phase("wheel rotate"):
+            frame = self.background.copy()
+            # PIL rotates anti-clockwise; wedge angles increase clockwise.
+            # Bilinear is plenty for an already anti-aliased bitmap and roughly
+            # three times cheaper than bicubic at this size.
+            turn = self.rest_angle_deg - angle_offset_deg
+            near_rest = abs((turn + 180) % 360 - 180) <= _SMOOTH_ROTATION_DEG
+            wheel = self.wheel.rotate(turn, resample=Image.BILINEAR if near_rest else Image.NEAREST)
+            frame.paste(wheel, self.wheel_offset, self.mask)
+        with _phase("needle"):
+            frame.paste(self.needle, self.needle_offset, self.needle)
+        return frame
+
+
+_POLAR_ANGLE_BINS = 3600  # 0.1° per texture column
+
+# Label sprites are cached per rotation rounded to this many degrees, within
+# a memory budget shared by every spin rendered in the process.
+LABEL_ROTATION_STEP_DEG = 0.5
+LABEL_CACHE_BYTES = int(os.environ.get("LABEL_CACHE_BYTES", 32 * 1024 * 1024))
+_label_sprites = SizedLRUCache(LABEL_CACHE_BYTES, _sprite_bytes)
+
+# Finished frames are cached per process, compressed, keyed by the roster and
+# the wheel angle rounded to FRAME_ANGLE_STEP_DEG, so repeat spins and rerolls
+# of the same games mostly reuse frames. The key is the roster itself, so a
+# changed roster can never be served stale frames; its old entries just age
+# out. Set FRAME_CACHE_BYTES to 0 to disable.
+FRAME_ANGLE_STEP_DEG = 0.25
+FRAME_CACHE_BYTES = int(os.environ.get("FRAME_CACHE_BYTES", 64 * 1024 * 1024))
+_frame_cache = SizedLRUCache(FRAME_CACHE_BYTES, lambda entry: len(entry[1]))
+# Encoded GIF image blocks, keyed by the frame cache keys of a frame and the
+# one before it (blocks are deltas). Shares FRAME_CACHE_BYTES' on/off switch.
+BLOCK_CACHE_BYTES = int(os.environ.get("BLOCK_CACHE_BYTES", 64 * 1024 * 1024))
+_block_cache = SizedLRUCache(BLOCK_CACHE_BYTES, lambda block: len(block[1]))
+
+
+@functools.lru_cache(maxsize=8)
+def _polar_lookup(size: int, radius: int, reach: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute, for a `size`×`size` canvas, which pixels show the wheel and
+    where each one samples the unwrapped texture.
+
+    Returns (pixels, gather): flat canvas indices of every pixel within
+    `reach` of the centre that the needle doesn't cover, and the matching
+    flat index into an (angle, radius) texture that is `reach` columns wide.
+    Depends only on geometry, so it's shared by every spin.
+    """
+    centre = size / 2
+    ys, xs = np.mgrid[0:size, 0:size]
+    dx = xs + 0.5 - centre
+    dy = ys + 0.5 - centre
+    r = np.hypot(dx, dy)
+
+    needle = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    _draw_needle(ImageDraw.Draw(needle), size // 2, size // 2, radius)
+    inside = (r < reach - 1) & (np.asarray(needle)[..., 3] == 0)
+
+    theta = np.degrees(np.arctan2(dy[inside], dx[inside])) % 360
+    angle_idx = np.rint(theta * (_POLAR_ANGLE_BINS / 360)).astype(np.intp) % _POLAR_ANGLE_BINS
+    radius_idx = np.minimum(np.rint(r[inside]).astype(np.intp), reach - 1)
+
+    return np.flatnonzero(inside), angle_idx * reach + radius_idx
+
+
+class _PolarWheel:
+    """
+    NumPy renderer for the "polar" mode.
+
+    The resting wheel from _WheelLayers is unwrapped once into an
+    angle×radius strip of palette indices. A frame is then the static
+    background-and-needle frame with every wheel pixel gathered from the
+    strip at a shifted angle column, so cost no longer depends on how many
+    slices or labels the wheel has. The strip is stored twice end to end so
+    the shift never needs a modulo.
+    """
+
+    def __init__(self, layers: _WheelLayers, size: int, radius: int, palette: Image.Image):
+        self.rest_angle_deg = layers.rest_angle_deg
+        self.size = size
+        self.palette = palette
+        reach = layers.wheel.width // 2
+        self.reach = reach
+        self.pixels, self.gather = _polar_lookup(size, radius, reach)
+
+        base = layers.background.copy()
+        base.alpha_composite(layers.needle, dest=layers.needle_offset)
+        base_p = base.convert("RGB").quantize(palette=self.palette, dither=Image.Dither.NONE)
+        self.base = np.asarray(base_p).reshape(-1)
+
+        # Bilinear-sample the resting wheel at each (angle, radius) cell.
+        wheel = np.asarray(layers.wheel, dtype=np.float32)
+        theta = np.radians(np.arange(_POLAR_ANGLE_BINS) * (360 / _POLAR_ANGLE_BINS))
+        radii = np.arange(reach)
+        centre = layers.wheel.width / 2 - 0.5
+        sx = np.clip(centre + np.outer(np.cos(theta), radii), 0, layers.wheel.width - 1.001)
+        sy = np.clip(centre + np.outer(np.sin(theta), radii), 0, layers.wheel.height - 1.001)
+        x0, y0 = sx.astype(np.intp), sy.astype(np.intp)
+        fx, fy = (sx - x0)[..., None], (sy - y0)[..., None]
+        strip = (
+            wheel[y0, x0] * (1 - fx) * (1 - fy)
+            + wheel[y0, x0 + 1] * fx * (1 - fy)
+            + wheel[y0 + 1, x0] * (1 - fx) * fy
+            + wheel[y0 + 1, x0 + 1] * fx * fy
+        )
+        strip_p = Image.fromarray(np.rint(strip).astype(np.uint8)).quantize(
+            palette=self.palette, dither=Image.Dither.NONE
+        )
+        self.texture = np.tile(np.asarray(strip_p), (2, 1)).reshape(-1)
+
+    def render(self, angle_offset_deg: float) -> Image.Image:
+        """Gather a palette-indexed frame with the wheel turned by `angle_offset_deg`."""
+        turn = angle_offset_deg - self.rest_angle_deg
+        shift = round(-turn * _POLAR_ANGLE_BINS / 360) % _POLAR_ANGLE_BINS
+
+        with _phase("polar gather"):
+            out = self.base.copy()
+            out[self.pixels] = self.texture.take(self.gather + shift * self.reach)
+            frame = Image.fromarray(out.reshape(self.size, self.size))
+            frame.putpalette(self.palette.getpalette())
+        return frame
+
+
+_FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/Library/Fonts/Arial Bold.ttf",
+    "arial.ttf",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _font_path() -> str | None:
+    """The first candidate font that loads, probed once per process."""
+    for path in _FONT_CANDIDATES:
         try:
-            return ImageFont.truetype(path, size)
+            ImageFont.truetype(path, FONT_SIZE)
+            return path
         except (IOError, OSError):
             continue
-    return ImageFont.load_default()
+    logger.warning("No TrueType font found, wheel labels will use PIL's default font")
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _load_font(size: int) -> ImageFont.FreeTypeFont:
+    """Load the wheel font at `size`; fall back to PIL default. Fonts are shared per process."""
+    path = _font_path()
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+def _font_size_for(game_count: int) -> int:
+    """
+    Scale font size to the number of games: fewer games = bigger slices = bigger text.
+    Clamp between MIN_FONT_SIZE (many games) and MAX_FONT_SIZE (few games).
+    Apply FONT_SCALE from environment to adjust for DPI differences across systems.
+    """
+    font_scale = float(os.environ.get("FONT_SCALE", "1.0"))
+    return max(MIN_FONT_SIZE, min(MAX_FONT_SIZE, int((34 - game_count * 0.8) * font_scale)))
+
+
+def _scaled_font_size(game_count: int, quality: Quality) -> int:
+    """_font_size_for, scaled down with the canvas for smaller quality tiers."""
+    return max(SCALED_MIN_FONT_SIZE, round(_font_size_for(game_count) * quality.size / SIZE))
+
+
+def _large_wheel(settings: Quality) -> Quality:
+    """`settings` for a large wheel: the same tier on a bigger canvas."""
+    return replace(settings, size=round(settings.size * LARGE_WHEEL_SCALE))
+
+
+def _abbreviate(label: str, font: ImageFont.FreeTypeFont, max_length: float) -> str:
+    """`label`, cut short with an ellipsis if it is longer than `max_length` pixels in `font`."""
+    if font.getlength(label) <= max_length:
+        return label
+    for end in range(len(label) - 1, 0, -1):
+        short = label[:end].rstrip() + "…"
+        if font.getlength(short) <= max_length:
+            return short
+    return ""
+
+
+def _wheel_labels(
+    games: list[str], winning_index: int, settings: Quality, icons: list[str | None] | None = None
+) -> tuple[list, int]:
+    """
+    What to put on each slice, "" for nothing, and the font size to use;
+    worked out once per spin. Small wheels label every slice in full.
+
+    On a large wheel the font shrinks to fit the slices' thickness at the
+    label, but no further than LARGE_MIN_FONT_SIZE: past that only every
+    n-th slice is labelled, always including the winner. Names that would
+    run past the rim are abbreviated.
+
+    `icons` gives each game's banner URL, or None. A game whose thumbnail
+    is already cached gets it as an _Icon instead of its name, if the
+    slice is thick enough to show it; nothing is fetched here.
+    """
+    font_size = _scaled_font_size(len(games), settings)
+    thickness = 2 * math.pi * settings.radius * _LABEL_RADIUS / len(games)
+    max_length = 2 * (1 - _LABEL_RADIUS) * settings.radius - _LABEL_RIM_MARGIN
+
+    labels = games
+    if len(games) > LARGE_WHEEL_GAMES:
+        fitted = int(thickness * _LABEL_FILL)
+        every = math.ceil(LARGE_MIN_FONT_SIZE / max(fitted, 1))
+        font_size = max(LARGE_MIN_FONT_SIZE, min(font_size, fitted))
+
+        font = _load_font(font_size)
+        labels = [
+            _abbreviate(game, font, max_length) if i % every == winning_index % every else ""
+            for i, game in enumerate(games)
+        ]
+
+    if icons:
+        scale = settings.size / SIZE
+        box = (min(round(ICON_SIZE[0] * scale), int(max_length)),
+               min(round(ICON_SIZE[1] * scale), int(thickness * _LABEL_FILL)))
+        if box[1] >= MIN_ICON_HEIGHT:
+            labels = [
+                _Icon(url, data, box) if label and url and (data := thumbnail_cache.get(url)) else label
+                for label, url in zip(labels, icons)
+            ]
+    return labels, font_size
+
+
+def preload_fonts() -> None:
+    """Load every size a wheel can use, so the first spin in a process doesn't pay for it."""
+    # Sizes shrink with smaller tiers' canvases (and byte budget steps) down to
+    # SCALED_MIN_FONT_SIZE, and grow with a large wheel's
+    largest = max(
+        max(_scaled_font_size(0, settings), _scaled_font_size(LARGE_WHEEL_GAMES + 1, _large_wheel(settings)))
+        for settings in QUALITY_TIERS.values()
+    )
+    for size in range(min(SCALED_MIN_FONT_SIZE, LARGE_MIN_FONT_SIZE), largest + 1):
+        _load_font(size)
 
 
 def calculate_gif_duration(file_name: str) -> float:
@@ -205,14 +899,16 @@ def _generate_rotations(
     start_rotation: float,
     complete_rotations: int,
     end_rotation: float,
+    profile: SpinProfile = SPIN_PROFILES[DEFAULT_SPIN_PROFILE],
 ) -> list[float]:
     """
-    Generate per-frame rotation angles with smooth ease-in/ease-out.
+    Generate per-frame rotation angles with smooth ease-in/ease-out, with the
+    speed and phase lengths of `profile`.
     Returns a list of absolute angle values (degrees).
     """
-    max_speed = 30
-    accel_frames = 20
-    decel_frames = 220
+    max_speed = profile.max_speed
+    accel_frames = profile.accel_frames
+    decel_frames = profile.decel_frames
 
     total_rotation = (complete_rotations * 360) + (360 - end_rotation) + start_rotation
 
@@ -221,7 +917,7 @@ def _generate_rotations(
     # Single continuous curve: parameterised to start partway along a fractional-
     # power curve so the initial decel rate is gentle (no perceptible jerk at the
     # handoff from constant speed), and the tail naturally slows to near-zero over
-    # ~1.5s for suspense on close calls. Max decel-rate change is <0.001 deg/frame².
+    # ~1.5s (at the standard profile's length) for suspense on close calls. Max decel-rate change is <0.001 deg/frame².
     _t0 = 0.55
     _exp = 0.35
     def _t(i): return _t0 + (1 - _t0) * i / decel_frames
@@ -233,7 +929,7 @@ def _generate_rotations(
     degrees_left = total_rotation - sum(accel) - sum(decel)
     if degrees_left < 0:
         logger.debug("Rotation too small for easing phases — adding extra rotations.")
-        return _generate_rotations(start_rotation, complete_rotations + 2, end_rotation)
+        return _generate_rotations(start_rotation, complete_rotations + 2, end_rotation, profile)
 
     constant = [max_speed] * int(degrees_left / max_speed)
     speed_profile = accel + constant + decel
@@ -254,57 +950,620 @@ def _generate_rotations(
     return frames
 
 
-def generate_wheel_of_games(games: list[str], winning_index: int, file_name: str) -> None:
+def _stride_rotations(
+    rotations: list[float],
+    durations: list[int],
+    stride: int,
+) -> tuple[list[float], list[int]]:
+    """
+    Keep every `stride`-th frame, each lasting as long as the frames it
+    stands in for, so playback time is unchanged. The last group ends on the
+    landing angle so the wheel still stops exactly where it should.
+    """
+    angles = rotations[::stride]
+    kept = [sum(durations[i:i + stride]) for i in range(0, len(rotations), stride)]
+    angles[-1] = rotations[-1]
+    return angles, kept
+
+
+def _decimate_rotations(
+    rotations: list[float],
+    min_step_deg: float = ADAPTIVE_MIN_STEP_DEG,
+    max_frame_ms: int = ADAPTIVE_MAX_FRAME_MS,
+) -> tuple[list[float], list[int]]:
+    """
+    Drop frames that barely move the wheel, giving their time to the frame
+    shown before them. Every kept frame still appears at its original time,
+    so total playback is unchanged, and the last angle is always kept so the
+    landing is exact. Returns (angles, durations in ms).
+    """
+    angles = [rotations[0]]
+    durations = [FRAME_DURATION_MS]
+    for angle in rotations[1:]:
+        if (abs(angle - angles[-1]) < min_step_deg
+                and durations[-1] + FRAME_DURATION_MS <= max_frame_ms):
+            durations[-1] += FRAME_DURATION_MS
+        else:
+            angles.append(angle)
+            durations.append(FRAME_DURATION_MS)
+
+    if angles[-1] != rotations[-1]:
+        # The landing frame was folded into its predecessor; split it back out.
+        durations[-1] -= FRAME_DURATION_MS
+        angles.append(rotations[-1])
+        durations.append(FRAME_DURATION_MS)
+    return angles, durations
+
+
+def _canonical_rest_angle(game_count: int, rest_angle_deg: float) -> float:
+    """
+    A stand-in for `rest_angle_deg` that flips the same labels upright.
+
+    Which labels are flipped only changes where a slice centre crosses 90° or
+    270°, so every rest angle between two such crossings gives the same
+    wheel layer. Drawing the layer at the middle of that range instead of
+    the exact rest angle lets spins that stop in the same range share frames.
+    """
+    slice_deg = 360.0 / game_count
+    # Crossings come every half slice, or every slice when 180° is a whole
+    # number of slices and the two sets of crossings line up.
+    step = slice_deg if game_count % 2 == 0 else slice_deg / 2
+    first = 90 - slice_deg / 2
+    k = math.floor((rest_angle_deg - first) / step)
+    return (first + (k + 0.5) * step) % 360
+
+
+def frame_cache_stats() -> dict[str, int]:
+    """Entries, bytes, hits and misses of this process's frame cache."""
+    return _frame_cache.stats()
+
+
+def clear_frame_cache() -> None:
+    """Drop every cached frame, and the GIF blocks encoded from them."""
+    _frame_cache.clear()
+    _block_cache.clear()
+
+
+def clear_caches() -> None:
+    """Empty every per-process cache, so the next spin renders from scratch."""
+    clear_frame_cache()
+    _label_sprites.clear()
+
+
+def _frame_key_fn(
+    games: list[str],
+    colours: list[tuple[int, int, int]],
+    render_mode: str,
+    font: ImageFont.FreeTypeFont,
+    rest_angle_deg: float,
+    quality: Quality = QUALITY_TIERS["full"],
+):
+    """
+    Function giving the frame cache key for a wheel angle, or None when
+    frames in `render_mode` aren't cached. Frames with the same key are
+    identical, which also lets the GIF encoder reuse their encoded blocks.
+    """
+    # Polar frames are a single gather, quicker to redraw than to decompress.
+    if render_mode == "polar" or FRAME_CACHE_BYTES <= 0:
+        return None
+
+    # Classic frames don't depend on where the spin stops; cached ones only on the layer.
+    layer_key = _canonical_rest_angle(len(games), rest_angle_deg) if render_mode == "cached" else None
+    roster_key = (
+        render_mode, tuple(games), tuple(colours), getattr(font, "path", None), getattr(font, "size", None),
+        layer_key, quality,
+    )
+    steps_per_turn = round(360 / FRAME_ANGLE_STEP_DEG)
+
+    def frame_key(angle: float) -> tuple:
+        return roster_key + (round(angle / FRAME_ANGLE_STEP_DEG) % steps_per_turn,)
+
+    return frame_key
+
+
+def _frame_renderer(
+    games: list[str],
+    colours: list[tuple[int, int, int]],
+    render_mode: str,
+    font: ImageFont.FreeTypeFont,
+    palette: Image.Image,
+    rest_angle_deg: float,
+    quality: Quality = QUALITY_TIERS["full"],
+):
+    """The per-frame function for `render_mode`, returning palette-index arrays at `quality`."""
+    # Layers are drawn on first use, so a spin served entirely from the caches never draws the wheel
+    @functools.lru_cache(maxsize=1)
+    def renderer():
+        size, radius, shadow_passes = quality.size, quality.radius, quality.shadow_passes
+        if render_mode == "classic":
+            return lambda angle: _render_frame(games, colours, angle, size, radius, font, shadow_passes)
+        with _phase("layers"):
+            if render_mode == "cached":
+                layers = _WheelLayers(
+                    games, colours, size, radius, font,
+                    rest_angle_deg=_canonical_rest_angle(len(games), rest_angle_deg), shadow_passes=shadow_passes,
+                )
+                return layers.render
+            layers = _WheelLayers(
+                games, colours, size, radius, font, rest_angle_deg=rest_angle_deg, shadow_passes=shadow_passes
+            )
+            return _PolarWheel(layers, size, radius, palette).render
+
+    def render_indices(angle: float) -> np.ndarray:
+        frame = renderer()(angle)
+        if frame.mode != "P":
+            with _phase("quantize"):
+                # Nearest-colour mapping onto the spin palette; no per-frame median cut.
+                # The RGBA frame is closed straight away so only the indices stay resident.
+                pal_frame = frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+                frame.close()
+                frame = pal_frame
+        return np.asarray(frame)
+
+    frame_key = _frame_key_fn(games, colours, render_mode, font, rest_angle_deg, quality)
+    if frame_key is None:
+        return render_indices
+
+    def render_cached(angle: float) -> np.ndarray:
+        with _phase("frame cache"):
+            key = frame_key(angle)
+            entry = _frame_cache.get(key)
+            if entry is not None:
+                shape, data = entry
+                return np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(shape)
+            # Render at the rounded angle, so a frame looks the same whether it was cached or not.
+            frame = render_indices(key[-1] * FRAME_ANGLE_STEP_DEG)
+            _frame_cache.put(key, (frame.shape, zlib.compress(frame.tobytes(), 1)))
+            return frame
+
+    return render_cached
+
+
+@functools.lru_cache(maxsize=1)
+def _worker_frame_renderer(
+    games: tuple[str, ...],
+    colours: tuple[tuple[int, int, int], ...],
+    render_mode: str,
+    font_size: int,
+    rest_angle_deg: float,
+    quality: Quality,
+):
+    """A frame worker's renderer for the spin it is currently helping with."""
+    return _frame_renderer(
+        list(games), list(colours), render_mode, _load_font(font_size),
+        _build_palette(list(colours), quality.palette_size, _icon_colours(games)), rest_angle_deg, quality,
+    )
+
+
+def _render_chunk(
+    games: tuple[str, ...],
+    colours: tuple[tuple[int, int, int], ...],
+    render_mode: str,
+    font_size: int,
+    rest_angle_deg: float,
+    quality: Quality,
+    angles: list[float],
+) -> list[np.ndarray]:
+    """Render a contiguous run of frames in a frame worker process."""
+    render = _worker_frame_renderer(games, colours, render_mode, font_size, rest_angle_deg, quality)
+    return [render(angle) for angle in angles]
+
+
+_FRAME_CHUNK = 16  # frames per task handed to a frame worker
+
+_frame_pool: ProcessPoolExecutor | None = None
+_frame_pool_workers = 0
+
+
+def _get_frame_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared pool for splitting one spin across cores, kept warm between spins."""
+    global _frame_pool, _frame_pool_workers
+    if _frame_pool is None or _frame_pool_workers != workers:
+        if _frame_pool is not None:
+            _frame_pool.shutdown(wait=False)
+        else:
+            # Stop the frame workers as the process exits, or they keep it alive.
+            # Render service workers are pool processes, which exit through
+            # multiprocessing's finalizers rather than atexit; this one has to
+            # run before the pool's own queues close (exitpriority 10).
+            multiprocessing.util.Finalize(None, shutdown_frame_pool, exitpriority=20)
+        _frame_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=preload_fonts
+        )
+        _frame_pool_workers = workers
+    return _frame_pool
+
+
+def shutdown_frame_pool():
+    """Stop the frame workers, and with them their caches; the next spin that needs them starts new ones."""
+    global _frame_pool
+    if _frame_pool is not None:
+        _frame_pool.shutdown(wait=True, cancel_futures=True)
+        _frame_pool = None
+
+
+def _render_in_workers(render_chunk, rotations: list[float], workers: int):
+    """
+    Yield frames rendered by the frame pool, in order. Only a couple of chunks
+    per worker are in flight at once, so finished frames don't pile up ahead
+    of the encoder.
+    """
+    pool = _get_frame_pool(workers)
+    chunks = (rotations[i:i + _FRAME_CHUNK] for i in range(0, len(rotations), _FRAME_CHUNK))
+    in_flight = collections.deque()
+    try:
+        for chunk in chunks:
+            in_flight.append(pool.submit(render_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:
+        # The encoder gave up early (over its byte budget): don't render the rest
+        for future in in_flight:
+            future.cancel()
+
+
+def _encode_spin(
+    games: list[str],
+    winning_index: int,
+    colours: list[tuple[int, int, int]],
+    rotations: list[float],
+    durations: list[int],
+    render_mode: str,
+    frame_workers: int,
+    settings: Quality,
+    max_bytes: int | None,
+    icons: list[str | None] | None,
+) -> tuple[bytes, int, float]:
+    """
+    Render and encode the frames at `rotations` with `settings`. Returns the
+    GIF, its frame count and the seconds spent drawing frames. Raises
+    GifSizeLimitError as soon as the GIF can't fit in `max_bytes`, or is
+    projected not to from its first few frames.
+    """
+    # From here on the slices are drawn with their labels, which may be icons,
+    # or shortened or left out on large wheels
+    games, font_size = _wheel_labels(games, winning_index, settings, icons)
+    font = _load_font(font_size)
+    palette = _build_palette(colours, settings.palette_size, _icon_colours(games))
+
+    # --- Render frames ---
+    # Re-using a single render call per frame is the core speed improvement.
+    # Time spent drawing is tallied separately, since with the serial path
+    # the encoder only draws a frame when its block isn't already cached.
+    render_s = 0.0
+
+    def timed(draw, *args):
+        nonlocal render_s
+        render_start = time.perf_counter()
+        result = draw(*args)
+        render_s += time.perf_counter() - render_start
+        return result
+
+    if frame_workers > 1:
+        # Frames depend only on the angle, so each worker builds the renderer
+        # for this spin once and reuses it for every chunk it is handed.
+        render_chunk = functools.partial(
+            _render_chunk, tuple(games), tuple(colours), render_mode, font_size, rotations[-1], settings
+        )
+        rendered = _render_in_workers(render_chunk, rotations, frame_workers)
+        frames = (timed(next, rendered) for _ in rotations)
+    else:
+        render = _frame_renderer(games, colours, render_mode, font, palette, rotations[-1], settings)
+        frames = (functools.partial(timed, render, angle) for angle in rotations)
+
+    # --- Encode GIF ---
+    # Each frame goes straight to the writer: delta frames against a single
+    # global colour table; see util.gif_encoder. Frames with a cache key can
+    # reuse image blocks encoded by earlier spins of the same roster.
+    frame_key = _frame_key_fn(games, colours, render_mode, font, rotations[-1], settings)
+    buffer = io.BytesIO()
+    writer = GifWriter(buffer, palette.getpalette(), block_cache=_block_cache if frame_key else None,
+                       max_bytes=max_bytes, frame_count=len(rotations))
+    try:
+        for angle, frame, duration in zip(rotations, frames, durations):
+            with _phase("encode"):
+                writer.add_frame(frame, duration, key=frame_key(angle) if frame_key else None)
+        with _phase("encode"):
+            frame_count = writer.close()
+    finally:
+        if frame_workers > 1:
+            rendered.close()
+    logger.debug(f"Reused {writer.blocks_reused} of {frame_count} encoded frames")
+    return buffer.getvalue(), frame_count, render_s
+
+
+def generate_wheel_of_games(
+    games: list[str],
+    winning_index: int,
+    file_name: str | None = None,
+    render_mode: str = DEFAULT_RENDER_MODE,
+    adaptive_timing: bool = False,
+    frame_workers: int = 1,
+    quality: str = "full",
+    max_bytes: int | None = None,
+    icons: list[str | None] | None = None,
+    spin_profile: str = DEFAULT_SPIN_PROFILE,
+) -> WheelResult:
     """
     Generate an animated GIF of a spinning wheel landing on `winning_index`.
     All rendering is done with PIL (no matplotlib), which is significantly faster.
+    The GIF is returned in memory in the WheelResult, and also written to
+    `file_name` if one is given (handy for debugging).
+
+    `render_mode` is one of RENDER_MODES; see _WheelLayers for "cached".
+    `adaptive_timing` renders fewer, longer frames in the slow tail of the
+    spin; see _decimate_rotations. With `frame_workers` > 1 the frames are
+    split into contiguous chunks rendered by that many processes, then
+    reassembled in order for encoding. `quality` names one of QUALITY_TIERS,
+    for when a spin has to come back faster than it would at full quality.
+    Wheels of more than LARGE_WHEEL_GAMES are drawn as large wheels, on a
+    bigger canvas in "polar" mode whatever `render_mode` says, with labels
+    from _wheel_labels. `icons` are the games' banner URLs, shown on their
+    slices where a thumbnail is already cached (see util.thumbnail_cache).
+    `spin_profile` names one of SPIN_PROFILES, for shorter spins.
+
+    With `max_bytes`, a spin that comes out larger is redone with cheaper
+    settings, in the order of _budget_steps, skipping steps its size
+    estimate says won't fit; a still of the result is the last resort,
+    drawn smaller until it fits too. The settings used end up in the result.
+    Raises GifSizeLimitError if not even the smallest still fits.
+
+    Frames are encoded as they are rendered rather than collected first,
+    so memory doesn't grow with the length of the spin.
     """
-    # Scale font size to the number of games: fewer games = bigger slices = bigger text.
-    # Clamp between 13 (many games) and 22 (few games).
-    # Apply FONT_SCALE from environment to adjust for DPI differences across systems.
-    font_scale = float(os.environ.get("FONT_SCALE", "1.0"))
-    dynamic_font_size = max(13, min(22, int((34 - len(games) * 0.8) * font_scale)))
-    font = _load_font(dynamic_font_size)
+    if render_mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {render_mode!r}, expected one of {RENDER_MODES}")
+    settings = _quality(quality)
+    profile = _spin_profile(spin_profile)
+    if len(games) > LARGE_WHEEL_GAMES:
+        # Polar frames cost the same however many slices there are
+        settings, render_mode = _large_wheel(settings), "polar"
+
+    started = time.perf_counter()
     colours = _assign_colours(len(games))
 
     start_angle = random.uniform(0, 360)
-    complete_rotations = int(random.uniform(4, 8))
-    slice_deg = 360.0 / len(games)
-
-    # Target angle: needle (at the 3 o'clock position) points at winning slice
-    winning_max = 360 - (winning_index * slice_deg + 1)
-    winning_min = winning_max - (slice_deg - 2)
-    winning_rotation = random.uniform(winning_min, winning_max)
+    complete_rotations = int(random.uniform(profile.min_rotations, profile.max_rotations))
+    winning_rotation = _winning_rotation(len(games), winning_index)
 
-    rotations = _generate_rotations(start_angle, complete_rotations, winning_rotation)
+    with _phase("rotations"):
+        rotations = _generate_rotations(start_angle, complete_rotations, winning_rotation, profile)
 
     logger.debug(f"start={start_angle:.1f} rotations={complete_rotations} "
                  f"target={winning_rotation:.1f}")
 
-    # --- Render frames ---
-    # Re-using a single render call per frame is the core speed improvement.
-    # The RGBA frame is explicitly closed after palette conversion so the full-colour
-    # buffer doesn't stay resident for the entire list before save.
-    frames: list[Image.Image] = []
-    for angle in rotations:
-        frame = _render_frame(games, colours, angle, SIZE, RADIUS, font)
-        pal_frame = frame.convert("P", palette=Image.ADAPTIVE, colors=128)
-        frame.close()
-        frames.append(pal_frame)
-
-    # Hold on the final frame
-    for _ in range(20):
-        frames.append(frames[-1])
-
-    # --- Save GIF ---
-    # Use optimize=False and lzw compression for speed; adaptive palette per-frame
-    durations = [FRAME_DURATION_MS] * len(rotations) + [120] * 20  # last frames linger longer
-
-    frames[0].save(
-        file_name,
-        save_all=True,
-        append_images=frames[1:],
-        duration=durations,
-        loop=0,
-        optimize=False,
-    )
\ No newline at end of file
+    with _phase("rotations"):
+        if adaptive_timing:
+            rotations, durations = _decimate_rotations(rotations)
+        else:
+            durations = [FRAME_DURATION_MS] * len(rotations)
+
+    render_started = time.perf_counter()
+    over_budget_s = 0.0  # spent on attempts that came out too large
+    attempts = [settings] + (_budget_steps(settings) if max_bytes is not None else [])
+    over_budget = None  # (settings, estimated full size) of the last attempt that didn't fit
+    for candidate in attempts:
+        if over_budget is not None and candidate is not attempts[-1] and \
+                _estimate_bytes(over_budget[1], over_budget[0], candidate, colours) > max_bytes * _BUDGET_MARGIN:
+            continue
+
+        angles, frame_durations = rotations, list(durations)
+        if candidate.frame_stride > 1:
+            angles, frame_durations = _stride_rotations(rotations, durations, candidate.frame_stride)
+        # Hold on the final frame as a single long frame rather than repeats.
+        frame_durations[-1] += profile.hold_ms
+
+        attempt_started = time.perf_counter()
+        try:
+            data, frame_count, attempt_render_s = _encode_spin(
+                games, winning_index, colours, angles, frame_durations, render_mode, frame_workers, candidate, max_bytes,
+                icons,
+            )
+        except GifSizeLimitError as e:
+            estimate = e.projected_bytes or e.bytes_written * len(angles) / max(e.frames_written, 1)
+            logger.debug(f"Over the {max_bytes} byte budget at {candidate} after {e.frames_written} of "
+                         f"{len(angles)} frames, about {estimate:.0f} bytes in all")
+            over_budget = (candidate, estimate)
+            over_budget_s += time.perf_counter() - attempt_started
+            continue
+        render_s = attempt_render_s
+        encode_s = time.perf_counter() - attempt_started - render_s
+        settings, durations = candidate, frame_durations
+        break
+    else:
+        logger.info(f"No spin of {len(games)} games fits in {max_bytes} bytes, sending a still")
+        # At the cheapest settings tried, so the still is as small as a spin's last frame could be
+        still_started = time.perf_counter()
+        settings = attempts[-1]
+        while True:
+            frame, labels = _render_still_frame(games, winning_index, colours, rotations[-1], settings, icons)
+            data = _png_bytes(frame, _build_palette(colours, settings.palette_size, _icon_colours(labels)))
+            if len(data) <= max_bytes:
+                break
+            size = round(settings.size * _STILL_SIZE_SCALE)
+            if size < _STILL_MIN_SIZE:
+                raise GifSizeLimitError(len(data), 1)
+            logger.debug(f"Still at {settings.size}px is {len(data)} bytes, over the {max_bytes} byte budget")
+            settings = replace(settings, size=size)
+        frame_count, durations = 1, [0]
+        render_s, encode_s = time.perf_counter() - still_started, 0.0
+        quality = STILL_QUALITY
+    finished = time.perf_counter()
+    if settings is not attempts[0]:
+        logger.info(f"Spin of {len(games)} games reduced to {settings} to fit in {max_bytes} bytes")
+
+    if file_name:
+        with open(file_name, "wb") as fp:
+            fp.write(data)
+
+    return WheelResult(
+        data=data,
+        duration=sum(durations) / 1000.0,
+        frame_count=frame_count,
+        winning_angle=rotations[-1] % 360,
+        timings={
+            "setup_ms": (render_started - started) * 1000,
+            "render_ms": render_s * 1000,
+            "encode_ms": encode_s * 1000,
+            "over_budget_ms": over_budget_s * 1000,
+            "total_ms": (finished - started) * 1000,
+        },
+        frame_cache=frame_cache_stats(),
+        format="png" if quality == STILL_QUALITY else "gif",
+        quality=quality,
+        settings=asdict(settings),
+        max_bytes=max_bytes,
+        spin_profile=spin_profile,
+    )
+
+
+def _render_still_frame(
+    games: list[str],
+    winning_index: int,
+    colours: list[tuple[int, int, int]],
+    angle: float,
+    settings: Quality,
+    icons: list[str | None] | None = None,
+) -> tuple[Image.Image, list]:
+    """The wheel at `angle` in classic mode, and the labels it was drawn with."""
+    # Labels are upright for any angle in classic mode, so the still matches a spin's last frame
+    labels, font_size = _wheel_labels(games, winning_index, settings, icons)
+    frame = _render_frame(
+        labels, colours, angle, settings.size, settings.radius, _load_font(font_size), settings.shadow_passes
+    )
+    return frame, labels
+
+
+def _png_bytes(frame: Image.Image, palette: Image.Image | None = None) -> bytes:
+    """`frame` as a PNG; mapped onto `palette` if one is given, which makes it much smaller."""
+    frame = frame.convert("RGB")
+    if palette is not None:
+        frame = frame.quantize(palette=palette, dither=Image.Dither.NONE)
+    buffer = io.BytesIO()
+    frame.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def render_still(
+    games: list[str],
+    winning_index: int,
+    file_name: str | None = None,
+    quality: str = "full",
+    icons: list[str | None] | None = None,
+) -> WheelResult:
+    """
+    Render only the wheel as it comes to rest on `winning_index`, as a PNG.
+    The fallback for when there's no time to render a spin at all.
+    """
+    settings = _quality(quality)
+    if len(games) > LARGE_WHEEL_GAMES:
+        settings = _large_wheel(settings)
+    started = time.perf_counter()
+    winning_rotation = _winning_rotation(len(games), winning_index)
+    frame, _ = _render_still_frame(
+        games, winning_index, _assign_colours(len(games)), winning_rotation, settings, icons
+    )
+    render_finished = time.perf_counter()
+
+    data = _png_bytes(frame)
+    finished = time.perf_counter()
+
+    if file_name:
+        with open(file_name, "wb") as fp:
+            fp.write(data)
+
+    return WheelResult(
+        data=data,
+        duration=0.0,
+        frame_count=1,
+        winning_angle=winning_rotation % 360,
+        timings={
+            "setup_ms": 0.0,
+            "render_ms": (render_finished - started) * 1000,
+            "encode_ms": (finished - render_finished) * 1000,
+            "total_ms": (finished - started) * 1000,
+        },
+        format="png",
+        quality=STILL_QUALITY,
+        settings=asdict(settings),
+    )
+
+
+def _profile_main(argv: list[str] | None = None) -> None:
+    """
+    Render one spin and report where the time went.
+
+        python -m wheel_generator --profile [--games 12] [--mode cached]
+        python -m wheel_generator --profile --cprofile spin.prof --tracemalloc 15
+
+    --profile prints wall time per phase. Phases nest (labels are drawn
+    while building layers, frames while encoding) and each is charged only
+    its own time. --cprofile writes pstats output, which snakeviz,
+    gprof2dot or flameprof turn into call graphs and flame graphs, and
+    --tracemalloc prints the top allocation sites.
+    """
+    import argparse
+    import cProfile
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(prog="python -m wheel_generator", description="Profile one wheel spin.")
+    parser.add_argument("--profile", action="store_true", help="print wall time per render phase")
+    parser.add_argument("--cprofile", metavar="FILE", help="also write cProfile stats to FILE")
+    parser.add_argument("--tracemalloc", metavar="N", type=int, default=0, help="print the top N allocation sites")
+    parser.add_argument("--games", type=int, default=12, help="number of games on the wheel")
+    parser.add_argument("--mode", choices=RENDER_MODES, default=DEFAULT_RENDER_MODE)
+    parser.add_argument("--adaptive", action="store_true", help="use adaptive frame timing")
+    parser.add_argument("--spin", choices=SPIN_PROFILES, default=DEFAULT_SPIN_PROFILE, help="spin profile")
+    parser.add_argument("--warm", action="store_true", help="render the spin once first, so caches are warm")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    games = [f"Game number {i + 1}" for i in range(args.games)]
+
+    def spin() -> WheelResult:
+        random.seed(args.seed)
+        return generate_wheel_of_games(games, 0, render_mode=args.mode, adaptive_timing=args.adaptive,
+                                       spin_profile=args.spin)
+
+    if args.warm:
+        spin()
+
+    global _phase_timer
+    if args.profile:
+        _phase_timer = _PhaseTimer()
+    if args.tracemalloc:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+
+    result = spin()
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+    print(f"{args.games} games, {args.mode} mode, {args.spin} spin: {result.frame_count} frames, {len(result.data) / 1024:.0f} KiB, "
+          f"{result.timings['total_ms']:.0f}ms")
+
+    if _phase_timer is not None:
+        total = sum(_phase_timer.totals.values())
+        for name, seconds in sorted(_phase_timer.totals.items(), key=lambda item: -item[1]):
+            print(f"  {name:14} {seconds * 1000:8.1f}ms {seconds / total:6.1%}  ({_phase_timer.calls[name]} calls)")
+        _phase_timer = None
+
+    if args.tracemalloc:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Top {args.tracemalloc} allocation sites (peak {peak / 2 ** 20:.1f} MiB):")
+        for stat in snapshot.statistics("lineno")[:args.tracemalloc]:
+            print(f"  {stat}")
+
+    if profiler:
+        print(f"cProfile stats written to {args.cprofile}")
+
+
+if __name__ == "__main__":
+    _profile_main()
@@ -1,12 +1,18 @@
 import io
 import logging
 import random
+import time
 
 import matplotlib.patches as patches
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib import cm, rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
 from PIL import Image
 
+from renderers import WheelResult
+
 logger = logging.getLogger(__name__)
 
 # Wheel parameters
@@ -34,60 +40,104 @@ def iter_frames(image):
         pass
 
 
-# Function to create the wheel with a static triangle needle
-def create_wheel(games, slice_size, angle_offset=0):
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.set_xlim(-radius - 1, radius + 1)
-    ax.set_ylim(-radius - 1, radius + 1)
-
-    # Create wheel segments (each representing a game)
-    for i, game in enumerate(games):
-        start_angle = angle_offset + i * slice_size
-        end_angle = start_angle + slice_size
-
-        wedge = patches.Wedge(center=center, r=radius, theta1=start_angle, theta2=end_angle,
-                              facecolor=plt.cm.tab10(i % 10), edgecolor='black', lw=2)
-        ax.add_patch(wedge)
-
-        # Add text along the radius, flipped to read outward
-        angle_mid = (start_angle + end_angle) / 2  # Middle angle of the slice
-        text_radius = radius - 0.5  # Place the text slightly inward from the circumference
-
-        # Add text along the radius, flipped to read outward
-        angle_mid = (start_angle + end_angle) / 2  # Middle angle of the slice
-        text_radius = radius * 0.6  # Adjust text position closer to the center
-
-        # Calculate text position
-        x_pos = text_radius * np.cos(np.radians(angle_mid))
-        y_pos = text_radius * np.sin(np.radians(angle_mid))
+def _text_rotation(angle_mid):
+    # Determine the correct rotation angle for outward-facing text
+    if 90 < angle_mid <= 270:
+        return angle_mid + 180  # Flip text outward
+    return angle_mid
 
-        # Determine the correct rotation angle for outward-facing text
-        if 90 < angle_mid <= 270:
-            rotation = angle_mid + 180  # Flip text outward
-        else:
-            rotation = angle_mid
 
-        ax.text(x_pos, y_pos, game, ha='center', va='center', fontsize=10, color='white',
-                weight='bold', rotation_mode='anchor', rotation=rotation)  # Rotate text outward
-
-    # Draw the static triangle as the arrow needle
-    triangle_length = 0.8  # Size of the triangle
-    needle_distance = radius + 0.3  # Distance of the triangle from the wheel
-
-    # Coordinates for the triangle vertices
-    triangle_coords = [
-        [needle_distance - triangle_length, 0],  # Leftmost point of the triangle
-        [needle_distance, -0.3],  # Bottom-right of the triangle
-        [needle_distance, 0.3],  # Top-right of the triangle
-    ]
+class WheelFigure:
+    """
+    The wheel with a static triangle needle, drawn once on its own Agg canvas.
 
-    # Create the triangle and add it to the plot
-    arrow = patches.Polygon(triangle_coords, closed=True, facecolor='black')
-    ax.add_patch(arrow)
+    Frames only move the wedges and labels, so render() updates those
+    artists in place and reads pixels straight from the canvas instead of
+    building a new figure and round-tripping it through PNG.
+    """
 
-    ax.set_aspect('equal', 'box')
-    ax.axis('off')  # Turn off the axes for a cleaner look
-    return fig, ax
+    text_radius = radius * 0.6  # Adjust text position closer to the center
+
+    def __init__(self, games, slice_size):
+        self.slice_size = slice_size
+        # A standalone Figure rather than pyplot, so nothing is registered globally
+        self.fig = Figure(figsize=(6, 6))
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot()
+        ax.set_xlim(-radius - 1, radius + 1)
+        ax.set_ylim(-radius - 1, radius + 1)
+
+        # Create wheel segments (each representing a game)
+        self.wedges = []
+        self.texts = []
+        for i, game in enumerate(games):
+            wedge = patches.Wedge(center=center, r=radius, theta1=i * slice_size, theta2=(i + 1) * slice_size,
+                                  facecolor=cm.tab10(i % 10), edgecolor='black', lw=2)
+            ax.add_patch(wedge)
+            self.wedges.append(wedge)
+
+            # Add text along the radius, flipped to read outward
+            self.texts.append(ax.text(0, 0, game, ha='center', va='center', fontsize=10, color='white',
+                                      weight='bold', rotation_mode='anchor'))
+
+        # Draw the static triangle as the arrow needle
+        triangle_length = 0.8  # Size of the triangle
+        needle_distance = radius + 0.3  # Distance of the triangle from the wheel
+
+        # Coordinates for the triangle vertices
+        triangle_coords = [
+            [needle_distance - triangle_length, 0],  # Leftmost point of the triangle
+            [needle_distance, -0.3],  # Bottom-right of the triangle
+            [needle_distance, 0.3],  # Top-right of the triangle
+        ]
+
+        # Create the triangle and add it to the plot
+        arrow = patches.Polygon(triangle_coords, closed=True, facecolor='black')
+        ax.add_patch(arrow)
+
+        ax.set_aspect('equal', 'box')
+        ax.axis('off')  # Turn off the axes for a cleaner look
+
+        # Wedges always cover the same disc whatever the angle, so the tight crop
+        # savefig(bbox_inches='tight') used to work out per frame is fixed. Shrink
+        # the figure to it once, moving the axes the way savefig does, so frames
+        # come out the same size and pixel alignment as before.
+        self.set_angle(0)
+        self.canvas.draw()
+        bbox = self.fig.get_tightbbox(self.canvas.get_renderer()).padded(rcParams['savefig.pad_inches'])
+        ax.apply_aspect()
+        pos = ax.get_position(original=False)  # figure fraction
+        width, height = self.fig.get_size_inches()
+        self.fig.set_size_inches(bbox.width, bbox.height)
+        fixed = Bbox.from_extents(
+            (pos.x0 * width - bbox.x0) / bbox.width, (pos.y0 * height - bbox.y0) / bbox.height,
+            (pos.x1 * width - bbox.x0) / bbox.width, (pos.y1 * height - bbox.y0) / bbox.height,
+        )
+        ax.set_axes_locator(lambda a, r: fixed)
+
+    def set_angle(self, angle_offset):
+        for i, (wedge, text) in enumerate(zip(self.wedges, self.texts)):
+            start_angle = angle_offset + i * self.slice_size
+            end_angle = start_angle + self.slice_size
+            wedge.set_theta1(start_angle)
+            wedge.set_theta2(end_angle)
+
+            angle_mid = (start_angle + end_angle) / 2  # Middle angle of the slice
+            text.set_position((self.text_radius * np.cos(np.radians(angle_mid)),
+                               self.text_radius * np.sin(np.radians(angle_mid))))
+            text.set_rotation(_text_rotation(angle_mid))
+
+    def render(self, angle_offset):
+        """The wheel turned to `angle_offset`, as an RGBA image."""
+        self.set_angle(angle_offset)
+        self.canvas.draw()
+        # copy(), as the buffer is redrawn in place for the next frame
+        return Image.frombuffer(
+            "RGBA", self.canvas.get_width_height(), self.canvas.buffer_rgba(), "raw", "RGBA", 0, 1
+        ).copy()
+
+    def close(self):
+        self.fig.clear()
 
 
 def generate_rotations(start_rotation, complete_rotations, end_rotation):
@@ -149,7 +199,8 @@ def generate_rotations(start_rotation, complete_rotations, end_rotation):
     return frame_rotations
 
 
-def generate_wheel_of_games(games, winning_index, file_name):
+def generate_wheel_of_games(games, winning_index, file_name=None) -> WheelResult:
+    started = time.perf_counter()
     start_angle = int(random.uniform(0, 360))
 
     # minimum amount of times it will rotate fully
@@ -179,18 +230,36 @@ def generate_wheel_of_games(games, winning_index, file_name):
 
     logger.debug(f"rotations are {rotations}")
 
-    images = []
-    for angle in rotations:
-        fig, ax = create_wheel(games=games, slice_size=slice_size, angle_offset=angle)
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        images.append(Image.open(buf))
-        plt.close(fig)
+    render_started = time.perf_counter()
+    wheel = WheelFigure(games, slice_size)
+    images = [wheel.render(angle) for angle in rotations]
+    wheel.close()
 
     # Duplicate the last frame for 20 more frames
     for _ in range(20):
         images.append(images[-1])
 
     # Save the animation as a GIF
-    images[0].save(file_name, save_all=True, append_images=images[1:], duration=100, loop=0)
\ No newline at end of file
+    encode_started = time.perf_counter()
+    buffer = io.BytesIO()
+    images[0].save(buffer, format='GIF', save_all=True, append_images=images[1:], duration=100, loop=0)
+    finished = time.perf_counter()
+
+    # Only written to disk when asked, e.g. for debugging
+    if file_name:
+        with open(file_name, "wb") as fp:
+            fp.write(buffer.getbuffer())
+
+    return WheelResult(
+        data=buffer.getvalue(),
+        duration=len(images) * 100 / 1000,
+        # Pillow folds the identical hold frames into the last rotation frame
+        frame_count=len(rotations),
+        winning_angle=winning_rotation,
+        timings={
+            "setup_ms": (render_started - started) * 1000,
+            "render_ms": (encode_started - render_started) * 1000,
+            "encode_ms": (finished - encode_started) * 1000,
+            "total_ms": (finished - started) * 1000,
+        },
+    )
\ No newline at end of file